@@ -0,0 +1,43 @@
+"""Add ai_analysis columns to news_items
+
+Revision ID: 4ea99fbb4e7d
+Revises: 629e718706b5
+Create Date: 2026-10-16 12:04:31.518342
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4ea99fbb4e7d"
+down_revision: Union[str, Sequence[str], None] = "629e718706b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("news_items", sa.Column("relevance_score", sa.Float(), nullable=True))
+    op.add_column("news_items", sa.Column("confidence", sa.Float(), nullable=True))
+    op.add_column("news_items", sa.Column("ynk_summary", sa.Text(), nullable=True))
+
+    # Backfill from the existing JSON so old rows read the same as new ones
+    op.execute(
+        """
+        UPDATE news_items
+        SET relevance_score = (ai_analysis->>'relevance_score')::float,
+            confidence = (ai_analysis->>'confidence')::float,
+            ynk_summary = ai_analysis->>'ynk_summary'
+        WHERE jsonb_typeof(ai_analysis) = 'object'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("news_items", "ynk_summary")
+    op.drop_column("news_items", "confidence")
+    op.drop_column("news_items", "relevance_score")
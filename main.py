@@ -89,11 +89,17 @@ def main():
             traceback.print_exc()
             YNotCare = 0
 
-        # 4) output results
-        print("\n" + "=" * 80)
-        print(f"→ Category: {category}")
-        print(f"→ LLM priority: {cls.get('priority_llm')}")
-        print(f"→ Priority score: {format_priority(YNotCare)}")
+        # 4) output results (one write for the whole block)
+        print(
+            "\n".join(
+                [
+                    "\n" + "=" * 80,
+                    f"→ Category: {category}",
+                    f"→ LLM priority: {cls.get('priority_llm')}",
+                    f"→ Priority score: {format_priority(YNotCare)}",
+                ]
+            )
+        )
 
 
 if __name__ == "__main__":
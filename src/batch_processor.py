@@ -5,6 +5,7 @@ import os
 import sys
 import time
 from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from typing import Any, Dict, List, Tuple
 
 
@@ -129,7 +130,7 @@ class BatchNewsProcessor:
 
         # Combine cached and processed results
         all_results = cache_results + processed_results
-        all_results.sort(key=lambda x: x[0])  # Sort by index
+        all_results.sort(key=itemgetter(0))  # Sort by index
 
         return [result for _, result in all_results]
 
@@ -203,7 +204,7 @@ class BatchNewsProcessor:
 
         # Combine results
         all_results = cache_results + processed_results
-        all_results.sort(key=lambda x: x[0])
+        all_results.sort(key=itemgetter(0))
 
         return [result for _, result in all_results]
 
@@ -269,7 +270,7 @@ class BatchNewsProcessor:
                     )
 
             # Sort by priority (highest first)
-            user_feed.sort(key=lambda x: x["priority"], reverse=True)
+            user_feed.sort(key=itemgetter("priority"), reverse=True)
             user_feeds[user_id] = user_feed
 
             print(
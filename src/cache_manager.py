@@ -6,6 +6,7 @@ import os
 import pickle
 import time
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import Any, Dict, Optional
 
 
@@ -107,7 +108,7 @@ class CacheManager:
         # Manage cache size
         if len(self._cache) >= self._max_size:
             # Remove oldest items (simple FIFO)
-            keys_to_remove = list(self._cache.keys())[: self._max_size // 4]
+            keys_to_remove = list(islice(self._cache, self._max_size // 4))
             for key in keys_to_remove:
                 del self._cache[key]
             print(f"Cache cleaned up, removed {len(keys_to_remove)} old items")
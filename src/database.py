@@ -2,6 +2,7 @@
 """Database connection and session management using SQLAlchemy asyncpg."""
 
 # --- Импорты ---
+import json
 import os
 import sys
 
@@ -22,6 +23,18 @@ from sqlalchemy.pool import AsyncAdaptedQueuePool
 from alembic import command
 from alembic.config import Config
 
+# orjson (опционально) — быстрая (де)сериализация JSONB (кэш бандлов пользователей)
+try:
+    import orjson
+
+    def _json_serializer(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _json_deserializer = orjson.loads
+except ImportError:
+    _json_serializer = json.dumps
+    _json_deserializer = json.loads
+
 # --- Загрузка переменных окружения ---
 # Явно указываем путь к .env файлу относительно этого файла (src/)
 # Это делает загрузку более надежной независимо от того, откуда запускается скрипт
@@ -31,6 +44,9 @@ load_dotenv(dotenv_path)
 
 # --- Configuration ---
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Размер пула: фоновый пайплайн пишет кэш несколькими сессиями параллельно
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
 
 if not DATABASE_URL:
     # Попробуем альтернативный путь или выведем более понятную ошибку
@@ -57,8 +73,12 @@ engine = create_async_engine(
     DATABASE_URL,
     echo=False,  # Установи True для отладки SQL-запросов
     poolclass=AsyncAdaptedQueuePool,  # Хороший пул по умолчанию для asyncpg
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
     pool_pre_ping=True,  # Проверяет соединение перед использованием
     pool_recycle=3600,  # Пересоздает соединение каждые 60 минут
+    json_serializer=_json_serializer,  # JSON/JSONB параметры (orjson, если есть)
+    json_deserializer=_json_deserializer,  # JSON/JSONB результаты
 )
 
 # Создаем фабрику асинхронных сессий
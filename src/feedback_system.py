@@ -4,7 +4,7 @@ import json
 import os
 from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 
 @dataclass
@@ -154,6 +154,22 @@ class FeedbackSystem:
         """
         return self.user_preferences.get(user_id, {}).get(category, 0.5)
 
+    def get_user_preferences(
+        self, user_id: str, categories: Iterable[str]
+    ) -> Dict[str, float]:
+        """
+        Get user preference scores for several categories at once.
+
+        Args:
+            user_id: User identifier
+            categories: News categories (or subcategories)
+
+        Returns:
+            Dict mapping each category to its preference score (0.5 = neutral)
+        """
+        user_prefs = self.user_preferences.get(user_id, {})
+        return {category: user_prefs.get(category, 0.5) for category in categories}
+
     def get_feedback_stats(self) -> Dict[str, Any]:
         """Get feedback statistics."""
         if not self.feedback_storage:
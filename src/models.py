@@ -9,6 +9,7 @@ from sqlalchemy import (
     Column,
     Date,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -103,6 +104,10 @@ class NewsItem(Base):
         SMALLINT, nullable=False
     )  # Глобальная оценка важности 0-100
     ai_analysis = Column(JSONB, nullable=False, default={})  # Результаты классификации
+    # Поля ai_analysis, вынесенные в отдельные колонки (читаются без разбора JSON)
+    relevance_score = Column(Float, nullable=True)
+    confidence = Column(Float, nullable=True)
+    ynk_summary = Column(Text, nullable=True)
     fetched_at = Column(DateTime, nullable=False, default=func.now())
 
     # Связь один-ко-многим с фидбеком
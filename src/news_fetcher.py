@@ -9,8 +9,8 @@ import os
 import re  # Added for potential content cleaning
 import sys
 import time
-from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Set, Union
 
 import requests
@@ -546,7 +546,7 @@ class SmartNewsFetcher:
                 interest_bonus = max(interest_bonus, 13)  # Increased from 12
                 break
             elif isinstance(interest, dict):
-                main_cat = list(interest.keys())[0]
+                main_cat = next(iter(interest))
                 subcats = interest[main_cat]
                 if isinstance(subcats, list):
                     # Check if article's subcategory matches user's specific interests
@@ -658,25 +658,27 @@ class SmartNewsFetcher:
                 pass  # Article dropped if scoring fails
         print(f"\r   ✅ Relevance scoring: {len(scored_articles)} articles")
 
-        category_bundles = defaultdict(list)
+        category_bundles: Dict[str, List[Dict]] = {}
         for article in scored_articles:
             category = article.get("category", "general")
-            category_bundles[category].append(article)
+            category_bundles.setdefault(category, []).append(article)
 
         for category, category_articles in category_bundles.items():
-            category_articles.sort(
-                key=lambda x: x.get("relevance_score", 0), reverse=True
-            )
+            # Every scored article carries relevance_score, so a C-level getter suffices
+            category_articles.sort(key=itemgetter("relevance_score"), reverse=True)
             # Limit to top 25 articles per category for the bundle (increased from 20)
             category_bundles[category] = category_articles[:25]
 
-        print(
+        summary_lines = [
             f"🎯 Final news bundle ready: {sum(len(a) for a in category_bundles.values())} articles"
+        ]
+        summary_lines.extend(
+            f"   {category.upper()}: {len(category_articles)} articles"
+            for category, category_articles in category_bundles.items()
         )
-        for category, category_articles in category_bundles.items():
-            print(f"   {category.upper()}: {len(category_articles)} articles")
+        print("\n".join(summary_lines))
 
-        return dict(category_bundles)
+        return category_bundles
 
     def fetch_daily_news_bundle(self, user_preferences: Dict) -> Dict[str, List[Dict]]:
         """
@@ -17,12 +17,20 @@ This module is intended to be both:
 """
 
 import asyncio
+import copy
+import hashlib
 import inspect
+import logging
 import os
 import sys
 import time
-from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Union
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from itertools import compress
+from typing import Any, Awaitable, Dict, List, Optional, Set, Tuple, Union
+
+# Per-user / per-item progress goes to DEBUG so it costs nothing unless enabled
+logger = logging.getLogger(__name__)
 
 # ---------------------------
 # Path setup for internal imports
@@ -53,7 +61,7 @@ except ImportError as e:
     sys.exit(1)
 
 try:
-    from user_profile import USER_PROFILES, get_user_profile
+    from user_profile import USER_PROFILES
 
     print("✅ Imported user_profile successfully")
 except ImportError as e:
@@ -100,7 +108,9 @@ try:
     from sqlalchemy import (  # noqa: F401 (delete may be used in retention)
         delete,
         select,
+        update,
     )
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
 
     from database import AsyncSessionFactory  # Async session factory
     from src.models import NewsItem
@@ -119,6 +129,8 @@ except ImportError as e:
     UserNewsCache = None
     select = None
     delete = None
+    update = None
+    pg_insert = None
     DATABASE_AVAILABLE = False
 
 # Podcast generator (optional)
@@ -132,6 +144,46 @@ except ImportError as e:
     get_podcast_generator = None
     PODCAST_GENERATOR_AVAILABLE = False
 
+# ---------------------------
+# Stored AI analysis
+# ---------------------------
+
+# Written as ai_analysis["v"] on every save. Items whose stored version differs
+# are treated as incomplete and re-analysed; bump it to force re-analysis.
+AI_ANALYSIS_VERSION = 2
+
+# ai_analysis fields promoted to the top level of cached TOP-7 articles, with
+# their fallbacks when missing.
+_PROMOTED_AI_FIELDS = (
+    ("relevance_score", 0),
+    ("confidence", 0),
+    ("ynk_summary", "N/A"),
+)
+
+# ---------------------------
+# Console report template (CLI)
+# ---------------------------
+
+# Fields rendered per article and their fallbacks when missing.
+_ARTICLE_REPORT_FIELDS = (
+    ("title", None),
+    ("url", None),
+    ("category", None),
+    ("relevance_score", "N/A"),
+    ("importance_score", "N/A"),
+    ("ynk_summary", "N/A"),
+)
+
+_ARTICLE_REPORT_TEMPLATE = (
+    "\n--- Article {index} ---\n"
+    "📰 Title: {title}\n"
+    "🔗 URL: {url}\n"
+    "🏷️  Category: {category}\n"
+    "📊 Relevance Score: {relevance_score}\n"
+    "📈 Importance Score: {importance_score}\n"
+    "💡 YNK Summary: {ynk_summary}"
+)
+
 
 class NewsProcessingPipeline:
     """
@@ -150,7 +202,7 @@ class NewsProcessingPipeline:
         Initialize the pipeline.
 
         Args:
-            max_workers: Reserved for potential concurrency usage (not used directly here).
+            max_workers: Number of worker threads used for concurrent YNK summary generation.
         """
         self.max_workers = max_workers
         self.fetcher = SmartNewsFetcher()
@@ -162,6 +214,22 @@ class NewsProcessingPipeline:
         )
         self.processed_news_count = 0
         self.total_processing_time = 0.0
+        # System users in {id, email, profile} form (DB-less fallback), built once
+        self._system_users_cache: Optional[List[Dict[str, Any]]] = None
+        # Per-run YNK memo keyed by a fingerprint of article text + category, so
+        # wire-service duplicates of the same story are summarized only once per run
+        self._ynk_local_cache: Dict[bytes, str] = {}
+        # Worker threads for YNK summarizer calls, created on first use and kept
+        # for the lifetime of the pipeline instead of per save
+        self._ynk_pool: Optional[ThreadPoolExecutor] = None
+        # Single-slot memo of the per-bundle selection index: (bundle, index).
+        # All users in a run are selected from the same bundle object, so the
+        # flatten / threshold / title-interning work is shared between them.
+        self._bundle_index_memo: Optional[tuple] = None
+        # Per-user memo of derived interest targets (see _get_interest_targets)
+        self._interest_targets_cache: Dict[Any, tuple] = {}
+        # email -> DB user id, for API requests that identify users by email
+        self._user_id_by_email: Dict[str, int] = {}
         print(
             "🚀 NewsProcessingPipeline initialized with enhanced SmartNewsFetcher and PodcastGenerator"
         )
@@ -186,21 +254,26 @@ class NewsProcessingPipeline:
         """
         Return all in-memory/system users (fallback when DB is unavailable).
         """
-        users: List[Any] = []
-        for user_id in USER_PROFILES.keys():
-            user = get_user_profile(user_id)
-            if user:
-                users.append(user)
+        # USER_PROFILES already holds the profile objects (get_user_profile is a
+        # plain lookup into it), so there is nothing to rebuild per user
+        users = list(USER_PROFILES.values())
         print(f"👥 Loaded {len(users)} users from system")
         return users
 
-    async def get_all_users_from_db(self) -> List[Dict[str, Any]]:
+    async def get_all_users_from_db(
+        self, premium_only: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Fetch all registered users from the database.
 
+        Args:
+            premium_only: Only return users whose profile has is_premium set
+                (filtered in SQL).
+
         Returns:
-            A list of dicts {id, email, profile}, where profile is a normalized dict.
-            If DB is unavailable, returns converted system users as a fallback.
+            A list of dicts {id, email, is_premium, profile}, where profile is a
+            normalized dict. If DB is unavailable, returns converted system users
+            (never premium) as a fallback.
         """
         if not (
             DATABASE_AVAILABLE and AsyncSessionFactory and DBUser and DBUserProfile
@@ -208,43 +281,55 @@ class NewsProcessingPipeline:
             print(
                 "⚠️ Database not configured for fetching users. Returning system users."
             )
-            system_users = self.get_all_users()
-            db_user_list: List[Dict[str, Any]] = []
-            for user in system_users:
-                user_dict = self._convert_user_profile_to_dict(user)
-                db_user_list.append(
+            if premium_only:
+                return []
+            if self._system_users_cache is None:
+                profiles = map(self._convert_user_profile_to_dict, self.get_all_users())
+                self._system_users_cache = [
                     {
-                        "id": user_dict.get("user_id"),
-                        "email": f"{user_dict.get('user_id')}@example.com",
-                        "profile": user_dict,
+                        "id": profile.get("user_id"),
+                        "email": f"{profile.get('user_id')}@example.com",
+                        "is_premium": False,
+                        "profile": profile,
                     }
-                )
-            return db_user_list
+                    for profile in profiles
+                ]
+            return list(self._system_users_cache)
 
         async with AsyncSessionFactory() as db_session:
             try:
-                # Join User and UserProfile (outer join to allow users without profiles)
-                stmt = select(DBUser, DBUserProfile).join(DBUserProfile, isouter=True)
+                # Join User and UserProfile (outer join to allow users without
+                # profiles). Only columns are selected: loading the entities would
+                # also selectin-load every user's feedback (and its news items).
+                stmt = select(
+                    DBUser.id,
+                    DBUser.email,
+                    DBUserProfile.user_id.label("profile_user_id"),
+                    DBUserProfile.locale,
+                    DBUserProfile.interests,
+                    DBUserProfile.is_premium,
+                ).join(DBUserProfile, isouter=True)
+                if premium_only:
+                    stmt = stmt.where(DBUserProfile.is_premium.is_(True))
                 result = await db_session.execute(stmt)
-                db_users_with_profiles = result.all()
 
-                users_list: List[Dict[str, Any]] = []
-                for db_user, db_profile in db_users_with_profiles:
-                    users_list.append(
-                        {
-                            "id": db_user.id,
-                            "email": db_user.email,
-                            "profile": {
-                                "user_id": db_user.id,
-                                "locale": db_profile.locale if db_profile else "US",
-                                "language": "en",
-                                "city": None,
-                                "interests": db_profile.interests if db_profile else [],
-                            }
-                            if db_profile
-                            else None,
+                users_list: List[Dict[str, Any]] = [
+                    {
+                        "id": row.id,
+                        "email": row.email,
+                        "is_premium": bool(row.is_premium),
+                        "profile": {
+                            "user_id": row.id,
+                            "locale": row.locale,
+                            "language": "en",
+                            "city": None,
+                            "interests": row.interests,
                         }
-                    )
+                        if row.profile_user_id is not None
+                        else None,
+                    }
+                    for row in result
+                ]
 
                 print(f"👥 Loaded {len(users_list)} users from database")
                 return users_list
@@ -286,115 +371,314 @@ class NewsProcessingPipeline:
     # -------------------------------------------------------
 
     async def _save_news_items_to_db(
-        self, news_bundle: Dict[str, List[Dict[str, Any]]]
-    ) -> None:
+        self, news_bundle: Dict[str, List[Dict[str, Any]]], generate_ynk: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Persist unique news (by URL) to DB and ensure ai_analysis includes YNK summary.
 
         Args:
             news_bundle: Dict[category -> List[article dict]]
+            generate_ynk: Generate missing YNK summaries before saving. When False,
+                articles without one are saved with ynk_summary left empty (None).
+
+        Returns:
+            The saved news items as dicts shaped like NewsItem rows (with DB ids).
+            If saving fails, the news items stored during the last day instead.
         """
         if not (DATABASE_AVAILABLE and AsyncSessionFactory and NewsItem):
             print("⚠️ Database not configured for saving news items. Skipping.")
-            return
+            return []
 
-        # Flatten all articles from the bundle
-        all_articles: List[Dict[str, Any]] = []
+        # Flatten the bundle and deduplicate by URL in a single pass
+        articles_by_url: Dict[str, Dict[str, Any]] = {}
         for category_articles in news_bundle.values():
             if isinstance(category_articles, list):
-                all_articles.extend(category_articles)
-
-        # Deduplicate by URL
-        unique_urls: Set[str] = set()
-        articles_to_process: List[Dict[str, Any]] = []
-        for article in all_articles:
-            url = article.get("url")
-            if url and url not in unique_urls:
-                unique_urls.add(url)
-                articles_to_process.append(article)
+                for article in category_articles:
+                    url = article.get("url")
+                    if url and url not in articles_by_url:
+                        articles_by_url[url] = article
+        articles_to_process = list(articles_by_url.values())
 
         async with AsyncSessionFactory() as db_session:
             try:
+                # Pass 1: resolve existing items with one IN query, collect what needs
+                # writing. Plain columns are projected: loading full NewsItem
+                # entities would also selectin-load every item's feedback entries.
+                stmt = select(*self._news_item_columns()).where(
+                    NewsItem.url.in_(list(articles_by_url))
+                )
+                result = await db_session.execute(stmt)
+                existing_by_url = {row.url: row for row in result}
+
+                saved_news_list: List[Dict[str, Any]] = []
+                item_ids_to_update: List[int] = []
+                articles_to_update: List[Dict[str, Any]] = []
+                articles_to_insert: List[Dict[str, Any]] = []
                 for article in articles_to_process:
-                    # Try finding existing item by URL
-                    stmt = select(NewsItem).where(NewsItem.url == article["url"])
-                    result = await db_session.execute(stmt)
-                    existing_item = result.scalar_one_or_none()
+                    existing_item = existing_by_url.get(article["url"])
 
                     if existing_item:
                         # Use existing ID and update ai_analysis if incomplete
                         article["id"] = existing_item.id
-                        needs_ai_update = (
-                            not existing_item.ai_analysis
-                            or not isinstance(existing_item.ai_analysis, dict)
-                            or not existing_item.ai_analysis.get("ynk_summary")
-                            or "relevance_score" not in existing_item.ai_analysis
-                            or "confidence" not in existing_item.ai_analysis
+                        saved_news_list.append(dict(existing_item._mapping))
+                        # Anything but a dict (legacy or hand-edited rows) has no
+                        # version, so it counts as stale and is re-analysed
+                        stored_ai = (
+                            existing_item.ai_analysis
+                            if isinstance(existing_item.ai_analysis, dict)
+                            else {}
                         )
-
-                        if needs_ai_update:
-                            print(
-                                f"  🔄 Updating incomplete ai_analysis for existing item ID {existing_item.id}..."
-                            )
-
-                            ynk_summary = article.get("ynk_summary")
-                            if not ynk_summary:
-                                ynk_summary = self._generate_ynk_summary(article)
-                                article["ynk_summary"] = ynk_summary
-
-                            relevance_score = article.get("relevance_score", 0)
-                            confidence = article.get("confidence", 0)
-
-                            existing_item.ai_analysis = {
-                                "relevance_score": relevance_score,
-                                "confidence": confidence,
-                                "ynk_summary": ynk_summary,
-                            }
-                            db_session.add(existing_item)
-                            await db_session.commit()
-                            await db_session.refresh(existing_item)
-                            print(
-                                f"  ✅ Updated ai_analysis for item ID {existing_item.id}."
-                            )
+                        # Rows saved by a rank-only run are current but have no
+                        # summary yet; runs that generate YNK fill them in
+                        if stored_ai.get("v") != AI_ANALYSIS_VERSION or (
+                            generate_ynk and not existing_item.ynk_summary
+                        ):
+                            # Rows saved before versioning keep their summary
+                            if not article.get("ynk_summary"):
+                                article["ynk_summary"] = (
+                                    stored_ai.get("ynk_summary")
+                                    or existing_item.ynk_summary
+                                )
+                            item_ids_to_update.append(existing_item.id)
+                            articles_to_update.append(article)
                     else:
-                        # Create new NewsItem
-                        external_id = article.get("external_id") or article["url"]
-
-                        # Ensure YNK exists before save
-                        ynk_summary = article.get("ynk_summary")
-                        if not ynk_summary:
-                            ynk_summary = self._generate_ynk_summary(article)
-                            article["ynk_summary"] = ynk_summary
-
-                        new_item = NewsItem(
-                            external_id=external_id,
-                            source_name=article.get(
+                        articles_to_insert.append(article)
+
+                # Ensure YNK exists before save; missing summaries are generated
+                # concurrently instead of one summarizer round-trip at a time
+                if generate_ynk:
+                    missing_ynk = [
+                        a
+                        for a in articles_to_update + articles_to_insert
+                        if not a.get("ynk_summary")
+                    ]
+                    ynk_by_article = await self._generate_all_ynk(missing_ynk)
+                    for article in missing_ynk:
+                        article["ynk_summary"] = ynk_by_article[id(article)]
+
+                # Pass 2: bulk-update incomplete ai_analysis of existing items (by PK)
+                if item_ids_to_update:
+                    analysis_by_id = {
+                        item_id: self._build_ai_analysis_columns(article)
+                        for item_id, article in zip(
+                            item_ids_to_update, articles_to_update
+                        )
+                    }
+                    await db_session.execute(
+                        update(NewsItem),
+                        [
+                            {"id": item_id, **columns}
+                            for item_id, columns in analysis_by_id.items()
+                        ],
+                    )
+                    for saved in saved_news_list:
+                        saved.update(analysis_by_id.get(saved["id"], ()))
+                    print(
+                        f"  🔄 Updated incomplete ai_analysis for {len(item_ids_to_update)} existing items."
+                    )
+
+                # Pass 3: insert all new NewsItems in one statement; rows whose
+                # external_id already exists are left untouched
+                if articles_to_insert:
+                    # One timestamp for the whole batch (naive UTC, like the column)
+                    fetched_at = datetime.now(timezone.utc).replace(tzinfo=None)
+                    rows = [
+                        {
+                            "external_id": article.get("external_id") or article["url"],
+                            "source_name": article.get(
                                 "source_name", article.get("source", "Unknown")
                             ),
-                            title=article["title"],
-                            url=article["url"],
-                            category=article.get("category", "unknown"),
-                            subcategory=article.get("subcategory"),
-                            importance_score=article.get("importance_score", 0),
-                            ai_analysis={
-                                "relevance_score": article.get("relevance_score", 0),
-                                "confidence": article.get("confidence", 0),
-                                "ynk_summary": ynk_summary,
-                            },
-                            fetched_at=datetime.utcnow(),
-                        )
+                            "title": article["title"],
+                            "url": article["url"],
+                            "category": article.get("category", "unknown"),
+                            "subcategory": article.get("subcategory"),
+                            "importance_score": article.get("importance_score", 0),
+                            **self._build_ai_analysis_columns(article),
+                            "fetched_at": fetched_at,
+                        }
+                        for article in articles_to_insert
+                    ]
+                    # One row per external_id: ON CONFLICT DO UPDATE cannot touch
+                    # the same row twice within a single statement
+                    rows_by_external_id = {}
+                    for row in rows:
+                        rows_by_external_id.setdefault(row["external_id"], row)
+
+                    # Rows whose external_id already exists keep their data; the
+                    # no-op update only makes RETURNING report their IDs as well
+                    stmt = pg_insert(NewsItem).values(
+                        list(rows_by_external_id.values())
+                    )
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["external_id"],
+                        set_={"external_id": stmt.excluded.external_id},
+                    ).returning(NewsItem.id, NewsItem.external_id)
+                    result = await db_session.execute(stmt)
 
-                        db_session.add(new_item)
-                        await db_session.commit()
-                        await db_session.refresh(new_item)
-                        article["id"] = new_item.id
+                    # Splice the returned IDs back into the articles
+                    id_by_external_id = {ext_id: item_id for item_id, ext_id in result}
+                    for article, row in zip(articles_to_insert, rows):
+                        article["id"] = id_by_external_id.get(row["external_id"])
+                    for external_id, row in rows_by_external_id.items():
+                        saved_news_list.append(
+                            {"id": id_by_external_id.get(external_id), **row}
+                        )
+                    print(f"  ✅ Inserted {len(rows)} new news items.")
 
+                await db_session.commit()
                 print(
                     f"✅ Saved/Checked {len(articles_to_process)} unique news items to DB."
                 )
             except Exception as e:
-                print(f"⚠️ Error saving news items to DB: {e}")
+                # The batch is one transaction, so a single bad row fails all of
+                # it; rank from what is already stored rather than from nothing
+                print(
+                    f"⚠️ Error saving news items to DB: {e}. Falling back to the last day of stored news."
+                )
                 await db_session.rollback()
+                saved_news_list = await self._load_recent_news_items(db_session)
+
+        for saved in saved_news_list:
+            if saved["fetched_at"]:
+                saved["fetched_at"] = saved["fetched_at"].isoformat()
+        return saved_news_list
+
+    @staticmethod
+    def _news_item_columns() -> tuple:
+        """NewsItem columns returned for saved news (everything but relationships)."""
+        return (
+            NewsItem.id,
+            NewsItem.external_id,
+            NewsItem.source_name,
+            NewsItem.title,
+            NewsItem.url,
+            NewsItem.category,
+            NewsItem.subcategory,
+            NewsItem.importance_score,
+            NewsItem.ai_analysis,
+            NewsItem.relevance_score,
+            NewsItem.confidence,
+            NewsItem.ynk_summary,
+            NewsItem.fetched_at,
+        )
+
+    async def _load_recent_news_items(self, db_session) -> List[Dict[str, Any]]:
+        """
+        Read the news items fetched during the last day, shaped like saved news.
+
+        Used when saving a bundle fails, so the day's ranking still runs on the
+        news that is already stored.
+        """
+        try:
+            since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
+            stmt = select(*self._news_item_columns()).where(
+                NewsItem.fetched_at >= since
+            )
+            result = await db_session.execute(stmt)
+            recent = [dict(row._mapping) for row in result]
+            print(f"📤 Loaded {len(recent)} news items stored during the last day.")
+            return recent
+        except Exception as e:
+            print(f"⚠️ Error fetching stored news from DB: {e}")
+            return []
+
+    @staticmethod
+    def _build_ai_analysis_columns(article: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the stored AI analysis of an article as NewsItem column values.
+
+        relevance_score, confidence and ynk_summary get their own columns so
+        readers can select them without decoding JSON; ai_analysis keeps the
+        same fields plus the version sentinel.
+        """
+        ai_analysis = {
+            "relevance_score": article.get("relevance_score", 0),
+            "confidence": article.get("confidence", 0),
+            "ynk_summary": article.get("ynk_summary"),
+            "v": AI_ANALYSIS_VERSION,
+        }
+        return {
+            "ai_analysis": ai_analysis,
+            "relevance_score": ai_analysis["relevance_score"],
+            "confidence": ai_analysis["confidence"],
+            "ynk_summary": ai_analysis["ynk_summary"],
+        }
+
+    async def _generate_all_ynk(self, articles: List[Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Generate YNK summaries for several articles concurrently.
+
+        Articles with the same text and category are summarized once, and stories
+        already summarized in this run are served from the YNK memo. The I/O bound
+        per-article calls are spread over a thread pool of `self.max_workers`
+        workers.
+
+        Returns:
+            Dict mapping id(article) -> YNK summary.
+        """
+        if not articles:
+            return {}
+
+        # One representative article per fingerprint
+        fingerprint_of: Dict[int, bytes] = {}
+        representatives: Dict[bytes, Dict[str, Any]] = {}
+        for article in articles:
+            fingerprint = self._ynk_fingerprint(
+                self._extract_news_text(article), article.get("category", "general")
+            )
+            fingerprint_of[id(article)] = fingerprint
+            representatives.setdefault(fingerprint, article)
+
+        summary_by_fingerprint: Dict[bytes, str] = {
+            fp: self._ynk_local_cache[fp]
+            for fp in representatives
+            if fp in self._ynk_local_cache
+        }
+        pending = [
+            (fp, article)
+            for fp, article in representatives.items()
+            if fp not in summary_by_fingerprint
+        ]
+
+        if pending:
+            if self._ynk_pool is None:
+                self._ynk_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ynk"
+                )
+            loop = asyncio.get_running_loop()
+            summaries = await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._ynk_pool, self._generate_ynk_summary, a)
+                    for _, a in pending
+                )
+            )
+            for (fp, _), summary in zip(pending, summaries):
+                summary_by_fingerprint[fp] = summary
+
+        return {
+            id(article): summary_by_fingerprint[fingerprint_of[id(article)]]
+            for article in articles
+        }
+
+    @staticmethod
+    def _ynk_fingerprint(news_text: str, category: str) -> bytes:
+        """
+        Content key for the YNK memo.
+
+        The category is part of the key because it selects the summarizer prompt.
+        """
+        return hashlib.blake2b(
+            f"{news_text[:2048]}|{category}".encode("utf-8"), digest_size=16
+        ).digest()
+
+    @staticmethod
+    def _extract_news_text(article: Dict[str, Any]) -> str:
+        """Return the best available text of an article to summarize."""
+        return (
+            article.get("content", "")
+            or article.get("description", "")
+            or article.get("title", "")
+        )
 
     def _generate_ynk_summary(self, article: Dict[str, Any]) -> str:
         """
@@ -403,21 +687,26 @@ class NewsProcessingPipeline:
         Fallbacks:
         - If summarizer is missing, return a placeholder text.
         - If no content available, return a short reason.
+
+        Articles whose text and category match one already summarized in this
+        run reuse that summary instead of calling the summarizer again.
         """
         if not self.summarize_news_func:
             return "Summary generation module (summarizer.py) not available."
 
         try:
-            news_text = (
-                article.get("content", "")
-                or article.get("description", "")
-                or article.get("title", "")
-            )
+            news_text = self._extract_news_text(article)
             if not news_text.strip():
                 return "No content, description, or title available for summary."
 
             category = article.get("category", "general")
+            fingerprint = self._ynk_fingerprint(news_text, category)
+            cached_summary = self._ynk_local_cache.get(fingerprint)
+            if cached_summary is not None:
+                return cached_summary
+
             summary = self.summarize_news_func(news_text, category)
+            self._ynk_local_cache[fingerprint] = summary
             return summary
         except Exception as e:
             return f"Could not generate summary. Error: {e}"
@@ -426,29 +715,41 @@ class NewsProcessingPipeline:
     # Selection / Personalization
     # -------------------------------------------------------
 
-    def _select_top_articles_for_user(
+    # Minimal relevance for the per-interest guarantees in TOP-7 selection
+    MIN_RELEVANCE_THRESHOLD = 0.40
+
+    # Max users per cache upsert statement/transaction. Keeps transactions short
+    # and well under the 32767 bind-parameter limit of a single statement.
+    CACHE_WRITE_CHUNK_SIZE = 500
+
+    @staticmethod
+    def _article_relevance(article: Dict[str, Any]) -> float:
+        """Read article relevance from the top level or nested ai_analysis."""
+        if "relevance_score" in article:
+            return float(article.get("relevance_score") or 0)
+        return float(article.get("ai_analysis", {}).get("relevance_score") or 0)
+
+    def _get_bundle_index(
         self,
         classified_news_list: Union[
             List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]
         ],
-        user_profile: Union[Dict[str, Any], Any],
-    ) -> List[Dict[str, Any]]:
+    ) -> Dict[str, Any]:
         """
-        Select the TOP-7 articles for a specific user from ALREADY CLASSIFIED news.
-
-        Accepts either:
-        - flat list[List[article]], or
-        - dict[category -> list[article]] (will be flattened).
+        Build (or reuse) the user-independent index of a classified news bundle.
 
-        Guarantee logic:
-        - If user has specific subcategory interests, try to include 1 article per subcategory
-          if it meets MIN_RELEVANCE_THRESHOLD.
-        - Then try to include 1 per main category of interest, also thresholded.
-        - Fill the remainder with best overall articles by relevance.
+        The index is memoized on the identity of the bundle object, so selecting
+        TOP-7 for many users from the same bundle builds it only once. Bundles are
+        treated as read-only once classified.
 
         Returns:
-            A list of up to 7 articles sorted by relevance (highest first).
+            Dict with "ranked_articles" (all, by relevance desc), the qualified
+            "by_category" / "by_subcategory" buckets (same order), "title_id_of"
+            and the per-bundle "selections" / "prepared_articles" memos.
         """
+        memo = self._bundle_index_memo
+        if memo is not None and memo[0] is classified_news_list:
+            return memo[1]
 
         # Normalize input to a flat list
         if isinstance(classified_news_list, dict):
@@ -461,105 +762,287 @@ class NewsProcessingPipeline:
         else:
             flat_articles = []
 
-        user_profile_dict = self._convert_user_profile_to_dict(user_profile)
-        selected_articles: List[Dict[str, Any]] = []
-        seen_titles: Set[str] = set()
+        # Rank the bundle by relevance once (stable, so ties keep bundle order);
+        # every bucket below is built from this order and never re-sorted.
+        relevance_scores = [self._article_relevance(a) for a in flat_articles]
+        ranking = sorted(
+            range(len(flat_articles)), key=relevance_scores.__getitem__, reverse=True
+        )
+        ranked_articles = [flat_articles[i] for i in ranking]
+
+        # Apply the guarantee threshold once up front: steps 1) and 2) only ever
+        # pick from qualified articles, so they never scan the rest.
+        qualified_articles = list(
+            compress(
+                ranked_articles,
+                [relevance_scores[i] >= self.MIN_RELEVANCE_THRESHOLD for i in ranking],
+            )
+        )
+
+        # Intern normalized titles (casefolded, trimmed) to small ints once, so
+        # dedup probes below are plain int set lookups. Kept off the article
+        # dicts themselves since those are cached as-is in user bundles.
+        title_ids: Dict[str, int] = {}
+        title_id_of: Dict[int, int] = {
+            id(art): title_ids.setdefault(
+                (art.get("title") or "").casefold().strip(), len(title_ids)
+            )
+            for art in flat_articles
+        }
+
+        # Inverted index subcategory -> qualified articles, so each guaranteed
+        # subcategory is a single dict probe instead of a scan of the bundle
+        by_subcategory: Dict[str, List[Dict[str, Any]]] = {}
+        by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for art in qualified_articles:
+            by_category.setdefault(art.get("category"), []).append(art)
+            for subcat in {
+                art.get("sports_subcategory"),
+                art.get("economy_subcategory"),
+                art.get("tech_subcategory"),
+            }:
+                if subcat:
+                    by_subcategory.setdefault(subcat, []).append(art)
+
+        # Buckets are frozen into tuples: the index is shared by every user in a
+        # run, so no selection pass may reorder or extend them in place.
+        index = {
+            "ranked_articles": tuple(ranked_articles),
+            "by_category": {k: tuple(v) for k, v in by_category.items()},
+            "by_subcategory": {k: tuple(v) for k, v in by_subcategory.items()},
+            "title_id_of": title_id_of,
+            # Memo of finished TOP-7s, filled by _select_top_articles_for_user
+            "selections": {},
+            # Cache-ready article copies, filled by _build_user_top_7
+            "prepared_articles": {},
+        }
+        self._bundle_index_memo = (classified_news_list, index)
+        return index
+
+    def _get_interest_targets(
+        self, user_profile_dict: Dict[str, Any]
+    ) -> Tuple[List[str], Set[str]]:
+        """
+        Derive the main categories and specific subcategories a user asked for.
+
+        The result is memoized per user_id and reused while the user's interests
+        compare equal to the snapshot it was derived from (e.g. the bundle and the
+        podcast passes of the same run).
 
+        Returns:
+            (main_categories, specific_subcategories) - treat both as read-only.
+        """
+        user_id = user_profile_dict.get("user_id")
         user_interests = user_profile_dict.get("interests", [])
-        main_categories = [i for i in user_interests if isinstance(i, str)]
+        cached = self._interest_targets_cache.get(user_id)
+        if cached is not None and cached[0] == user_interests:
+            return cached[1], cached[2]
+
+        # One pass: plain string interests are main categories; dict interests such
+        # as {"sports": ["nba", "epl"]} contribute their key as a main category and
+        # their values as specific subcategories
+        main_categories: List[str] = []
         specific_subcategories: Set[str] = set()
-
-        # Collect nested subcategories found in dict interests, e.g. {"sports": ["nba", "epl"]}
         for interest in user_interests:
-            if isinstance(interest, dict):
-                for _, subcats in interest.items():
+            if isinstance(interest, str):
+                main_categories.append(interest)
+            elif isinstance(interest, dict):
+                for main_cat, subcats in interest.items():
+                    main_categories.append(main_cat)
                     if isinstance(subcats, list):
                         specific_subcategories.update(subcats)
+        main_categories = list(dict.fromkeys(main_categories))
+
+        self._interest_targets_cache[user_id] = (
+            copy.deepcopy(user_interests),
+            main_categories,
+            specific_subcategories,
+        )
+        return main_categories, specific_subcategories
+
+    def _select_top_articles_for_user(
+        self,
+        classified_news_list: Union[
+            List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]
+        ],
+        user_profile: Union[Dict[str, Any], Any],
+        bundle_index: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Select the TOP-7 articles for a specific user from ALREADY CLASSIFIED news.
+
+        Accepts either:
+        - flat list[List[article]], or
+        - dict[category -> list[article]] (will be flattened).
+
+        Callers selecting for many users should build the bundle index once with
+        `_get_bundle_index` and pass it as `bundle_index`.
+
+        Guarantee logic:
+        - If user has specific subcategory interests, try to include 1 article per subcategory
+          if it meets MIN_RELEVANCE_THRESHOLD.
+        - Then try to include 1 per main category of interest, also thresholded.
+        - Fill the remainder with best overall articles by relevance.
+
+        Returns:
+            A list of up to 7 articles sorted by relevance (highest first).
+        """
+        rel = self._article_relevance
+
+        if bundle_index is None:
+            bundle_index = self._get_bundle_index(classified_news_list)
+        by_category: Dict[str, Tuple[Dict[str, Any], ...]] = bundle_index["by_category"]
+        by_subcategory: Dict[str, Tuple[Dict[str, Any], ...]] = bundle_index[
+            "by_subcategory"
+        ]
+        title_id_of: Dict[int, int] = bundle_index["title_id_of"]
+
+        if not bundle_index["ranked_articles"]:
+            logger.debug("🎯 Final news bundle ready: 0 articles selected for TOP-7")
+            return []
+
+        user_profile_dict = self._convert_user_profile_to_dict(user_profile)
+        selected_articles: List[Dict[str, Any]] = []
+        seen_title_ids: Set[int] = set()
 
-        MIN_RELEVANCE_THRESHOLD = 0.40
+        main_categories, specific_subcategories = self._get_interest_targets(
+            user_profile_dict
+        )
 
-        # Helper to compute article relevance, reading from top-level or nested ai_analysis
-        def rel(a: Dict[str, Any]) -> float:
-            if "relevance_score" in a:
-                return float(a.get("relevance_score") or 0)
-            return float(a.get("ai_analysis", {}).get("relevance_score") or 0)
+        # Look up learned preferences once per interest, shared by both orderings below
+        prefs: Dict[str, float] = {}
+        if self.feedback_system and (main_categories or specific_subcategories):
+            prefs = self.feedback_system.get_user_preferences(
+                user_profile_dict.get("user_id", "unknown_user"),
+                (*specific_subcategories, *main_categories),
+            )
 
-        # 1) Guarantee specific subcategories (ordered by learned preference if available)
+        # Guarantee order: specific subcategories, then main categories (each
+        # ordered by learned preference if available)
         sorted_specific_subcats = list(specific_subcategories)
-        if self.feedback_system:
-            uid = user_profile_dict.get("user_id", "unknown_user")
-            sorted_specific_subcats.sort(
-                key=lambda s: self.feedback_system.get_user_preference(uid, s),
-                reverse=True,
+        sorted_main = list(main_categories)
+        if prefs:
+            sorted_specific_subcats.sort(key=prefs.__getitem__, reverse=True)
+            sorted_main.sort(key=prefs.__getitem__, reverse=True)
+
+        # The selection depends on nothing else, so users sharing both orderings
+        # (same interests and preference ranking, or no interests at all) share
+        # one TOP-7 per bundle
+        selections: Dict[tuple, tuple] = bundle_index["selections"]
+        selection_key = (tuple(sorted_specific_subcats), tuple(sorted_main))
+        cached_selection = selections.get(selection_key)
+        if cached_selection is not None:
+            final_selection = list(cached_selection)
+            logger.debug(
+                "🎯 Final news bundle ready: %s articles selected for TOP-7",
+                len(final_selection),
             )
+            return final_selection
 
+        # 1) Guarantee specific subcategories
         for subcategory in sorted_specific_subcats:
-            matching = []
-            for art in flat_articles:
-                art_subcats = [
-                    art.get("sports_subcategory"),
-                    art.get("economy_subcategory"),
-                    art.get("tech_subcategory"),
-                ]
-                if subcategory in art_subcats:
-                    matching.append(art)
-            matching.sort(key=rel, reverse=True)
-
-            for art in matching:
-                tk = (art.get("title") or "").lower()
-                if (
-                    tk not in seen_titles
-                    and len(selected_articles) < 7
-                    and rel(art) >= MIN_RELEVANCE_THRESHOLD
-                ):
+            if len(selected_articles) >= 7:
+                break
+            for art in by_subcategory.get(subcategory, ()):
+                tk = title_id_of[id(art)]
+                if tk not in seen_title_ids:
                     selected_articles.append(art)
-                    seen_titles.add(tk)
+                    seen_title_ids.add(tk)
                     break  # take only one for this subcategory
 
-        # 2) Guarantee main categories (ordered by learned preference if available)
-        sorted_main = list(main_categories)
-        if self.feedback_system:
-            uid = user_profile_dict.get("user_id", "unknown_user")
-            sorted_main.sort(
-                key=lambda c: self.feedback_system.get_user_preference(uid, c),
-                reverse=True,
-            )
-
+        # 2) Guarantee main categories
         for cat in sorted_main:
             if len(selected_articles) >= 7:
                 break
-            cat_arts = [a for a in flat_articles if a.get("category") == cat]
-            cat_arts.sort(key=rel, reverse=True)
-            for art in cat_arts:
-                tk = (art.get("title") or "").lower()
-                if (
-                    tk not in seen_titles
-                    and len(selected_articles) < 7
-                    and rel(art) >= MIN_RELEVANCE_THRESHOLD
-                ):
+            for art in by_category.get(cat, ()):
+                tk = title_id_of[id(art)]
+                if tk not in seen_title_ids:
                     selected_articles.append(art)
-                    seen_titles.add(tk)
+                    seen_title_ids.add(tk)
                     break  # take only one for this main category
 
         # 3) Fill the remainder with best-overall by relevance
         if len(selected_articles) < 7:
-            all_sorted = sorted(flat_articles, key=rel, reverse=True)
-            for art in all_sorted:
+            for art in bundle_index["ranked_articles"]:
                 if len(selected_articles) >= 7:
                     break
-                tk = (art.get("title") or "").lower()
-                if tk not in seen_titles:
+                tk = title_id_of[id(art)]
+                if tk not in seen_title_ids:
                     selected_articles.append(art)
-                    seen_titles.add(tk)
+                    seen_title_ids.add(tk)
 
         # Final sort by relevance desc
         final_selection = selected_articles[:7]
         final_selection.sort(key=rel, reverse=True)
-        print(
-            f"🎯 Final news bundle ready: {len(final_selection)} articles selected for TOP-7"
+        selections[selection_key] = tuple(final_selection)
+        logger.debug(
+            "🎯 Final news bundle ready: %s articles selected for TOP-7",
+            len(final_selection),
         )
         return final_selection
 
+    def _build_user_top_7(
+        self,
+        classified_news_list: Union[
+            List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]
+        ],
+        user_profile: Union[Dict[str, Any], Any],
+        bundle_index: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank stage for one user: select the TOP-7 and prepare it for caching.
+
+        Pure CPU work over the shared bundle (no I/O), so callers can run it for
+        all users before touching the database.
+
+        Returns:
+            Copies of the selected articles with ai_analysis fields promoted to
+            top-level for quick API usage. The nested ai_analysis itself is left
+            out, so it is not stored twice in every cached bundle. Each copy is
+            made once per bundle and shared by all users who get that article,
+            so treat them as read-only.
+        """
+        if bundle_index is None:
+            bundle_index = self._get_bundle_index(classified_news_list)
+        top_7_articles = self._select_top_articles_for_user(
+            classified_news_list, user_profile, bundle_index
+        )
+
+        prepared_articles: Dict[int, Dict[str, Any]] = bundle_index["prepared_articles"]
+        prepared_top_7: List[Dict[str, Any]] = []
+        for article in top_7_articles:
+            prepared = prepared_articles.get(id(article))
+            if prepared is None:
+                prepared = dict(article)
+                ai = prepared.pop("ai_analysis", None) or {}
+                # Top-level values win; ai_analysis is only read for missing ones
+                for key, default in _PROMOTED_AI_FIELDS:
+                    if key not in prepared:
+                        prepared[key] = ai.get(key, default)
+                prepared_articles[id(article)] = prepared
+            prepared_top_7.append(prepared)
+        return prepared_top_7
+
+    # -------------------------------------------------------
+    # Database pool
+    # -------------------------------------------------------
+
+    async def _prewarm_db_pool(self) -> None:
+        """
+        Open `max_workers` pooled connections at once, so the concurrent writers
+        later in the run find them already connected.
+        """
+        if not (DATABASE_AVAILABLE and AsyncSessionFactory):
+            return
+
+        sessions = [AsyncSessionFactory() for _ in range(self.max_workers)]
+        try:
+            await asyncio.gather(*(session.connection() for session in sessions))
+        except Exception as e:
+            print(f"⚠️ Could not prewarm DB connection pool: {e}")
+        finally:
+            await asyncio.gather(*(session.close() for session in sessions))
+
     # -------------------------------------------------------
     # Data retention
     # -------------------------------------------------------
@@ -594,17 +1077,25 @@ class NewsProcessingPipeline:
     # Background tasks (NEW architecture)
     # -------------------------------------------------------
 
-    async def fetch_and_classify_all_news(self) -> List[Dict[str, Any]]:
+    async def fetch_and_classify_all_news(
+        self, generate_ynk: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Background Task 1:
         - Fetches a broad set of news for many categories,
         - Saves unique news to DB (ensuring ai_analysis with YNK),
-        - Returns a list of saved items (converted from DB models).
+        - Returns the saved items (shaped like DB rows, with IDs).
+
+        Args:
+            generate_ynk: When False, news is saved and ranked without calling the
+                summarizer (rank-only runs); missing YNK summaries are filled by
+                the next run that generates them.
 
         Returns:
             List of dicts representing persisted news items.
         """
         print("\n--- [BACKGROUND TASK 1] Fetching and Classifying ALL News ---")
+        self._ynk_local_cache.clear()  # duplicates are only collapsed within one run
 
         # Wide-coverage "dummy" profile to gather everything we care about
         dummy_profile = {
@@ -625,7 +1116,11 @@ class NewsProcessingPipeline:
 
         start_time = time.time()
         print("📡 Fetching global news bundle for all categories...")
-        news_bundle = self.fetcher.fetch_daily_news_bundle(dummy_profile)
+        # The fetcher is blocking; run it in a thread so the event loop stays free
+        # (e.g. for the DB pool prewarm started by the daily run)
+        news_bundle = await asyncio.to_thread(
+            self.fetcher.fetch_daily_news_bundle, dummy_profile
+        )
         fetch_time = time.time() - start_time
         try:
             raw_total = sum(len(arts) for arts in news_bundle.values())
@@ -634,52 +1129,20 @@ class NewsProcessingPipeline:
             raw_total = len(news_bundle) if isinstance(news_bundle, list) else 0
         print(f"📦 Raw articles collected: {raw_total} (in {fetch_time:.2f}s)")
 
-        # Save to DB (also ensures AI analysis/YNK presence)
-        await self._save_news_items_to_db(news_bundle)
+        # Save to DB (also ensures AI analysis/YNK presence); the saved items come
+        # back with their IDs, so there is no need to load them again
+        saved_news_list = await self._save_news_items_to_db(
+            news_bundle, generate_ynk=generate_ynk
+        )
         save_time = time.time() - start_time - fetch_time
         print(f"💾 News saved/classified/YNK'd to DB (in {save_time:.2f}s)")
-
-        # Load back from DB (IDs + ai_analysis preserved)
-        if not (DATABASE_AVAILABLE and AsyncSessionFactory and NewsItem and select):
-            print("⚠️ Cannot fetch saved news from DB. Returning empty list.")
-            return []
-
-        async with AsyncSessionFactory() as db_session:
-            try:
-                since = datetime.utcnow() - timedelta(days=1)
-                stmt = select(NewsItem).where(NewsItem.fetched_at >= since)
-                result = await db_session.execute(stmt)
-                saved_news_items = result.scalars().all()
-
-                saved_news_list: List[Dict[str, Any]] = []
-                for item in saved_news_items:
-                    saved_news_list.append(
-                        {
-                            "id": item.id,
-                            "external_id": item.external_id,
-                            "source_name": item.source_name,
-                            "title": item.title,
-                            "url": item.url,
-                            "category": item.category,
-                            "subcategory": item.subcategory,
-                            "importance_score": item.importance_score,
-                            "ai_analysis": item.ai_analysis,  # includes relevance_score, confidence, ynk_summary
-                            "fetched_at": item.fetched_at.isoformat()
-                            if item.fetched_at
-                            else None,
-                        }
-                    )
-
-                print(
-                    f"📤 Fetched {len(saved_news_list)} classified news items with IDs from DB."
-                )
-                return saved_news_list
-            except Exception as e:
-                print(f"⚠️ Error fetching saved news from DB: {e}")
-                return []
+        print(f"📤 Returning {len(saved_news_list)} classified news items with IDs.")
+        return saved_news_list
 
     async def generate_and_cache_bundles_for_all_users(
-        self, classified_news_list: List[Dict[str, Any]]
+        self,
+        classified_news_list: List[Dict[str, Any]],
+        all_users: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
         """
         Background Task 2:
@@ -688,6 +1151,7 @@ class NewsProcessingPipeline:
 
         Args:
             classified_news_list: A flat list of news dicts (with ids and ai_analysis).
+            all_users: Users as returned by get_all_users_from_db; loaded if omitted.
         """
         print(
             "\n--- [BACKGROUND TASK 2] Generating Personalized Bundles for ALL Users ---"
@@ -697,7 +1161,8 @@ class NewsProcessingPipeline:
             print("⚠️ No classified news provided. Skipping bundle generation.")
             return
 
-        all_users = await self.get_all_users_from_db()
+        if all_users is None:
+            all_users = await self.get_all_users_from_db()
         if not all_users:
             print("⚠️ No users found in database. Skipping bundle generation.")
             return
@@ -709,81 +1174,119 @@ class NewsProcessingPipeline:
             return
 
         print(f"👥 Generating bundles for {len(all_users)} users...")
-        async with AsyncSessionFactory() as db_session:
-            try:
-                today = date.today()
 
-                for user_data in all_users:
-                    user_id = user_data["id"]
-                    user_email = user_data["email"]
-                    user_profile = user_data.get("profile")
-
-                    if not user_profile:
-                        print(
-                            f"⚠️ No profile found for user {user_email} (ID: {user_id}). Skipping."
-                        )
-                        continue
+        # Rank stage: pure CPU over the shared bundle, done for every user before
+        # any DB round-trip so it is not interleaved with awaits on the session
+        ranked_users: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = []
+        try:
+            bundle_index = self._get_bundle_index(classified_news_list)
+            for user_data in all_users:
+                user_id = user_data["id"]
+                user_email = user_data["email"]
+                user_profile = user_data.get("profile")
 
+                if not user_profile:
                     print(
-                        f"  🧠 Generating bundle for user {user_email} (ID: {user_id})..."
+                        f"⚠️ No profile found for user {user_email} (ID: {user_id}). Skipping."
                     )
+                    continue
 
-                    top_7_articles = self._select_top_articles_for_user(
-                        classified_news_list, user_profile
+                logger.debug(
+                    "  🧠 Generating bundle for user %s (ID: %s)...", user_email, user_id
+                )
+                ranked_users.append(
+                    (
+                        user_data,
+                        self._build_user_top_7(
+                            classified_news_list, user_profile, bundle_index
+                        ),
                     )
+                )
+        except Exception as e:
+            print(f"⚠️ Error generating/caching bundles for users: {e}")
+            return
 
-                    # Promote ai_analysis fields to top-level for quick API usage
-                    prepared_top_7: List[Dict[str, Any]] = []
-                    for article in top_7_articles:
-                        prepared = dict(article)
-                        ai = article.get("ai_analysis", {})
-                        prepared["relevance_score"] = prepared.get(
-                            "relevance_score", ai.get("relevance_score", 0)
-                        )
-                        prepared["confidence"] = prepared.get(
-                            "confidence", ai.get("confidence", 0)
-                        )
-                        prepared["ynk_summary"] = prepared.get(
-                            "ynk_summary", ai.get("ynk_summary", "N/A")
-                        )
-                        prepared_top_7.append(prepared)
+        # Persist stage: users are split into up to `max_workers` chunks, each
+        # written concurrently in its own session/transaction
+        today = date.today()
+        generated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        persist_start = time.time()
+        chunk_size = min(
+            max(1, -(-len(ranked_users) // self.max_workers)),
+            self.CACHE_WRITE_CHUNK_SIZE,
+        )
+        semaphore = asyncio.Semaphore(self.max_workers)
+        written = await asyncio.gather(
+            *(
+                self._cache_user_bundles_chunk(
+                    ranked_users[i : i + chunk_size], today, generated_at, semaphore
+                )
+                for i in range(0, len(ranked_users), chunk_size)
+            )
+        )
+        print(
+            f"🎉 {sum(written)}/{len(ranked_users)} user bundles cached for {today} "
+            f"(in {time.time() - persist_start:.2f}s)."
+        )
 
-                    cache_data = {
-                        "generated_at": datetime.utcnow().isoformat(),
-                        "top_7": prepared_top_7,
-                    }
+    async def _cache_user_bundles_chunk(
+        self,
+        ranked_users: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]],
+        today: date,
+        generated_at: datetime,
+        semaphore: asyncio.Semaphore,
+    ) -> int:
+        """
+        Upsert today's cache entries for one chunk of users in its own session.
 
-                    # Upsert today's cache entry
-                    stmt_check = select(UserNewsCache).where(
-                        UserNewsCache.user_id == user_id,
-                        UserNewsCache.news_date == today,
-                    )
-                    result = await db_session.execute(stmt_check)
-                    existing_cache = result.scalar_one_or_none()
+        Args:
+            ranked_users: (user_data, prepared_top_7) pairs from the rank stage.
+            today: Cache date.
+            generated_at: Generation time (naive UTC), shared by the whole run.
+            semaphore: Bounds how many chunks hold a DB connection at once.
 
-                    if existing_cache:
-                        existing_cache.news_bundle = cache_data
-                        existing_cache.generated_at = datetime.utcnow()
-                        print(f"    🔄 Updated cache for user {user_email}.")
-                    else:
-                        new_cache_entry = UserNewsCache(
-                            user_id=user_id,
-                            news_date=today,
-                            news_bundle=cache_data,
-                        )
-                        db_session.add(new_cache_entry)
-                        print(f"    ✅ Cached bundle for user {user_email}.")
+        Returns:
+            Number of bundles written (0 if the chunk was rolled back).
+        """
+        async with semaphore, AsyncSessionFactory() as db_session:
+            try:
+                generated_at_iso = generated_at.isoformat()
+                rows = [
+                    {
+                        "user_id": user_data["id"],
+                        "news_date": today,
+                        "news_bundle": {
+                            "generated_at": generated_at_iso,
+                            "top_7": prepared_top_7,
+                        },
+                        "generated_at": generated_at,
+                    }
+                    for user_data, prepared_top_7 in ranked_users
+                ]
 
-                await db_session.commit()
-                print(
-                    f"🎉 All {len(all_users)} user bundles cached successfully for {today}."
+                # One upsert for the whole chunk instead of SELECT + INSERT/UPDATE
+                # per user; the bundle replaces any earlier one for today
+                stmt = pg_insert(UserNewsCache).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["user_id", "news_date"],
+                    set_={
+                        "news_bundle": stmt.excluded.news_bundle,
+                        "generated_at": stmt.excluded.generated_at,
+                    },
                 )
+                await db_session.execute(stmt)
+                await db_session.commit()
+                return len(ranked_users)
             except Exception as e:
-                print(f"⚠️ Error generating/caching bundles for users: {e}")
+                print(f"⚠️ Error caching bundles for {len(ranked_users)} users: {e}")
                 await db_session.rollback()
+                return 0
 
     async def generate_and_cache_podcasts_for_premium_users(
-        self, classified_news_list: List[Dict[str, Any]]
+        self,
+        classified_news_list: List[Dict[str, Any]],
+        bundles_cached: Optional[Awaitable[Any]] = None,
+        all_users: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
         """
         Background Task 3:
@@ -792,6 +1295,10 @@ class NewsProcessingPipeline:
 
         Args:
             classified_news_list: A flat list of news dicts (with ids and ai_analysis).
+            bundles_cached: Optional pending Background Task 2. Scripts are generated
+                while it runs; it is awaited before any podcast is written.
+            all_users: Users as returned by get_all_users_from_db (premium ones are
+                picked out); if omitted, only premium users are loaded.
         """
         print(
             "\n--- [BACKGROUND TASK 3] Generating Personalized Podcasts for ALL Premium Users ---"
@@ -805,17 +1312,12 @@ class NewsProcessingPipeline:
             print("⚠️ Podcast generator is not available. Skipping podcast generation.")
             return
 
-        all_users = await self.get_all_users_from_db()
-        if not all_users:
-            print("⚠️ No users found in database. Skipping podcast generation.")
-            return
-
-        # TEMPORARY premium check: even user IDs are premium (replace with real logic)
-        premium_users = [
-            user
-            for user in all_users
-            if isinstance(user.get("id"), int) and user["id"] % 2 == 0
-        ]
+        # Premium users come from user_profiles.is_premium: filtered in SQL when
+        # loading here, or picked from the users the daily run already loaded
+        if all_users is None:
+            premium_users = await self.get_all_users_from_db(premium_only=True)
+        else:
+            premium_users = [user for user in all_users if user.get("is_premium")]
         if not premium_users:
             print("⚠️ No premium users found in database. Skipping podcast generation.")
             return
@@ -827,101 +1329,139 @@ class NewsProcessingPipeline:
             return
 
         print(f"👥 Generating podcasts for {len(premium_users)} premium users...")
-        async with AsyncSessionFactory() as db_session:
-            try:
-                today = date.today()
-
-                for user_data in premium_users:
-                    user_id = user_data["id"]
-                    user_email = user_data["email"]
-                    user_profile = user_data.get("profile")
-
-                    if not user_profile:
-                        print(
-                            f"⚠️ No profile found for premium user {user_email} (ID: {user_id}). Skipping."
-                        )
-                        continue
 
+        # Generate stage: build each premium user's TOP-7, then generate the
+        # podcast scripts concurrently (bounded by max_workers in-flight calls)
+        ranked_users: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = []
+        try:
+            bundle_index = self._get_bundle_index(classified_news_list)
+            for user_data in premium_users:
+                user_profile = user_data.get("profile")
+                if not user_profile:
                     print(
-                        f"  🎙️  Generating podcast for premium user {user_email} (ID: {user_id})..."
+                        f"⚠️ No profile found for premium user {user_data['email']} (ID: {user_data['id']}). Skipping."
                     )
-
-                    top_7_articles = self._select_top_articles_for_user(
-                        classified_news_list, user_profile
+                    continue
+                ranked_users.append(
+                    (
+                        user_data,
+                        self._build_user_top_7(
+                            classified_news_list, user_profile, bundle_index
+                        ),
                     )
+                )
+        except Exception as e:
+            print(f"⚠️ Error ranking news for premium users: {e}")
+            return
 
-                    prepared_top_7: List[Dict[str, Any]] = []
-                    for article in top_7_articles:
-                        prepared = dict(article)
-                        ai = article.get("ai_analysis", {})
-                        prepared["relevance_score"] = prepared.get(
-                            "relevance_score", ai.get("relevance_score", 0)
-                        )
-                        prepared["confidence"] = prepared.get(
-                            "confidence", ai.get("confidence", 0)
-                        )
-                        prepared["ynk_summary"] = prepared.get(
-                            "ynk_summary", ai.get("ynk_summary", "N/A")
-                        )
-                        prepared_top_7.append(prepared)
+        semaphore = asyncio.Semaphore(self.max_workers)
+        scripts = await asyncio.gather(
+            *(
+                self._generate_podcast_script_bounded(
+                    user_data, prepared_top_7, semaphore
+                )
+                for user_data, prepared_top_7 in ranked_users
+            )
+        )
+        podcasts: List[Tuple[Dict[str, Any], List[Dict[str, Any]], str]] = [
+            (user_data, prepared_top_7, podcast_script)
+            for (user_data, prepared_top_7), podcast_script in zip(
+                ranked_users, scripts
+            )
+        ]
 
-                    # --- Generate podcast script (sync or async safe) ---
-                    try:
-                        print(
-                            f"    🧠 Calling podcast generator for user {user_email}..."
-                        )
-                        maybe_result = self.podcast_generator.generate_podcast_script(
-                            user_profile, prepared_top_7
-                        )
-                        podcast_script = await self._maybe_await(maybe_result)
-                        print(f"    ✅ Podcast script generated for user {user_email}.")
-                    except Exception as e:
-                        print(
-                            f"    ⚠️ Error generating podcast script for user {user_email}: {e}"
-                        )
-                        podcast_script = "Sorry, the podcast script could not be generated at this time."
+        # The podcast is attached to today's bundle, so it must not be written
+        # before the bundle itself (which would otherwise overwrite it)
+        if bundles_cached is not None:
+            await bundles_cached
 
-                    # Upsert today's cache entry (attach podcast_script)
-                    stmt_check = select(UserNewsCache).where(
-                        UserNewsCache.user_id == user_id,
-                        UserNewsCache.news_date == today,
-                    )
-                    result = await db_session.execute(stmt_check)
-                    existing_cache = result.scalar_one_or_none()
-
-                    if existing_cache:
-                        bundle = existing_cache.news_bundle or {}
-                        bundle["top_7"] = prepared_top_7  # ensure top_7 present
-                        bundle["podcast_script"] = podcast_script
-                        existing_cache.news_bundle = bundle
-                        existing_cache.generated_at = datetime.utcnow()
-                        print(
-                            f"    🔄 Updated cache with podcast for user {user_email}."
-                        )
-                    else:
-                        cache_data = {
-                            "generated_at": datetime.utcnow().isoformat(),
+        if not podcasts:
+            print("⚠️ No podcasts generated. Nothing to cache.")
+            return
+
+        # Persist stage
+        written = 0
+        async with AsyncSessionFactory() as db_session:
+            try:
+                today = date.today()
+                generated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+                generated_at_iso = generated_at.isoformat()
+                rows = [
+                    {
+                        "user_id": user_data["id"],
+                        "news_date": today,
+                        "news_bundle": {
+                            "generated_at": generated_at_iso,
                             "top_7": prepared_top_7,
                             "podcast_script": podcast_script,
-                        }
-                        new_cache_entry = UserNewsCache(
-                            user_id=user_id,
-                            news_date=today,
-                            news_bundle=cache_data,
-                        )
-                        db_session.add(new_cache_entry)
-                        print(
-                            f"    ✅ Cached bundle with podcast for user {user_email}."
-                        )
+                        },
+                        "generated_at": generated_at,
+                    }
+                    for user_data, prepared_top_7, podcast_script in podcasts
+                ]
 
-                await db_session.commit()
+                # One upsert per chunk of premium users, each committed on its own;
+                # an existing bundle for today is merged with the new keys
+                # (JSONB ||) so its other fields are kept
+                chunk_size = self.CACHE_WRITE_CHUNK_SIZE
+                for i in range(0, len(rows), chunk_size):
+                    stmt = pg_insert(UserNewsCache).values(rows[i : i + chunk_size])
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["user_id", "news_date"],
+                        set_={
+                            "news_bundle": UserNewsCache.news_bundle.op("||")(
+                                stmt.excluded.news_bundle
+                            ),
+                            "generated_at": stmt.excluded.generated_at,
+                        },
+                    )
+                    await db_session.execute(stmt)
+                    await db_session.commit()
+                    written += len(rows[i : i + chunk_size])
                 print(
-                    f"🎉 All {len(premium_users)} premium user podcasts cached successfully for {today}."
+                    f"🎉 {written}/{len(premium_users)} premium user podcasts cached successfully for {today}."
                 )
             except Exception as e:
-                print(f"⚠️ Error generating/caching podcasts for premium users: {e}")
+                print(
+                    f"⚠️ Error caching podcasts for premium users ({written} already cached): {e}"
+                )
                 await db_session.rollback()
 
+    async def _generate_podcast_script_bounded(
+        self,
+        user_data: Dict[str, Any],
+        prepared_top_7: List[Dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+    ) -> str:
+        """
+        Generate one user's podcast script while holding a semaphore slot.
+
+        A sync generator runs in a worker thread so that several calls can be in
+        flight at once; an async one is awaited on the loop. Errors are turned
+        into a fallback script, so one failure does not affect other users.
+        """
+        user_email = user_data["email"]
+        async with semaphore:
+            logger.debug(
+                "  🎙️  Generating podcast for premium user %s (ID: %s)...",
+                user_email,
+                user_data["id"],
+            )
+            try:
+                maybe_result = await asyncio.to_thread(
+                    self.podcast_generator.generate_podcast_script,
+                    user_data["profile"],
+                    prepared_top_7,
+                )
+                podcast_script = await self._maybe_await(maybe_result)
+                logger.debug("    ✅ Podcast script generated for user %s.", user_email)
+                return podcast_script
+            except Exception as e:
+                print(
+                    f"    ⚠️ Error generating podcast script for user {user_email}: {e}"
+                )
+                return "Sorry, the podcast script could not be generated at this time."
+
     # -------------------------------------------------------
     # API-like read helpers
     # -------------------------------------------------------
@@ -945,15 +1485,16 @@ class NewsProcessingPipeline:
         async with AsyncSessionFactory() as db_session:
             try:
                 today = date.today()
-                stmt = select(UserNewsCache).where(
+                # Primary-key lookup of just the bundle column
+                stmt = select(UserNewsCache.news_bundle).where(
                     UserNewsCache.user_id == user_id,
                     UserNewsCache.news_date == today,
                 )
                 result = await db_session.execute(stmt)
-                cache_entry = result.scalar_one_or_none()
-                if cache_entry:
+                news_bundle = result.scalar_one_or_none()
+                if news_bundle is not None:
                     print(f"✅ Found cached news bundle for user ID {user_id}.")
-                    return cache_entry.news_bundle
+                    return news_bundle
                 else:
                     print(
                         f"⚠️ No cached news bundle found for user ID {user_id} for {today}."
@@ -981,15 +1522,16 @@ class NewsProcessingPipeline:
         async with AsyncSessionFactory() as db_session:
             try:
                 today = date.today()
-                stmt = select(UserNewsCache).where(
+                # Extract just the script server-side instead of loading the bundle
+                stmt = select(UserNewsCache.news_bundle["podcast_script"].astext).where(
                     UserNewsCache.user_id == user_id,
                     UserNewsCache.news_date == today,
                 )
                 result = await db_session.execute(stmt)
-                cache_entry = result.scalar_one_or_none()
+                cache_row = result.first()
 
-                if cache_entry and cache_entry.news_bundle:
-                    podcast_script = cache_entry.news_bundle.get("podcast_script")
+                if cache_row:
+                    podcast_script = cache_row[0]
                     if podcast_script:
                         print(f"✅ Found cached podcast script for user ID {user_id}.")
                         return {"script": podcast_script}
@@ -1045,31 +1587,35 @@ class NewsProcessingPipeline:
         try:
             # Load user profile from DB first (for premium flag or additional context)
             async with AsyncSessionFactory() as db_session:
+                # Columns only, so the user's feedback is not selectin-loaded
                 stmt = (
-                    select(DBUser, DBUserProfile)
+                    select(
+                        DBUser.id,
+                        DBUser.email,
+                        DBUserProfile.locale,
+                        DBUserProfile.interests,
+                        DBUserProfile.is_premium,
+                    )
                     .join(DBUserProfile, isouter=True)
                     .where(DBUser.id == user_id)
                 )
                 result = await db_session.execute(stmt)
-                db_user_with_profile = result.first()
+                row = result.first()
 
-                if not db_user_with_profile:
+                if not row:
                     print(
                         f"⚠️  User with ID {user_id} not found in DB for podcast generation."
                     )
                     return None
 
-                db_user, db_profile = db_user_with_profile
                 user_profile_data = {
-                    "user_id": db_user.id,
-                    "email": db_user.email,
-                    "locale": db_profile.locale if db_profile else "US",
+                    "user_id": row.id,
+                    "email": row.email,
+                    "locale": row.locale or "US",
                     "language": "en",
                     "city": None,
-                    "interests": db_profile.interests if db_profile else [],
-                    "is_premium": getattr(db_profile, "is_premium", False)
-                    if db_profile
-                    else False,
+                    "interests": row.interests if row.interests is not None else [],
+                    "is_premium": bool(row.is_premium),
                 }
 
             # --- Generate script (sync or async safe) ---
@@ -1109,14 +1655,21 @@ class NewsProcessingPipeline:
         else:
             # Fallback: try to find user by email
             email = user_prefs_dict.get("email") or f"{user_id_raw}@example.com"
-            if DATABASE_AVAILABLE and AsyncSessionFactory and DBUser and select:
+            db_user_id = self._user_id_by_email.get(email)
+            if (
+                db_user_id is None
+                and DATABASE_AVAILABLE
+                and AsyncSessionFactory
+                and DBUser
+                and select
+            ):
                 async with AsyncSessionFactory() as db_session:
                     try:
-                        stmt = select(DBUser).where(DBUser.email == email)
+                        stmt = select(DBUser.id).where(DBUser.email == email)
                         result = await db_session.execute(stmt)
-                        db_user = result.scalar_one_or_none()
-                        if db_user:
-                            db_user_id = db_user.id
+                        db_user_id = result.scalar_one_or_none()
+                        if db_user_id is not None:
+                            self._user_id_by_email[email] = db_user_id
                     except Exception as e:
                         print(f"⚠️ Error finding user ID for {email}: {e}")
 
@@ -1144,6 +1697,25 @@ class NewsProcessingPipeline:
                 "message": "Your personalized news feed is being prepared. Please try again in a few minutes.",
             }
 
+    # -------------------------------------------------------
+    # Console rendering (CLI)
+    # -------------------------------------------------------
+
+    @staticmethod
+    def _format_top_7_lines(top_7_articles: List[Dict[str, Any]]) -> List[str]:
+        """
+        Build the console report for a TOP-7 list in a single pass.
+
+        Returns:
+            Output lines in display order, ready to be joined with newlines.
+        """
+        lines: List[str] = []
+        for i, article in enumerate(top_7_articles, start=1):
+            values = {k: article.get(k, d) for k, d in _ARTICLE_REPORT_FIELDS}
+            values["index"] = i
+            lines.append(_ARTICLE_REPORT_TEMPLATE.format_map(values))
+        return lines
+
     # -------------------------------------------------------
     # Main orchestrator (background daily run)
     # -------------------------------------------------------
@@ -1159,14 +1731,41 @@ class NewsProcessingPipeline:
         print("🚀 Starting NEW Full Daily News Pipeline Run (Background Task)...")
         pipeline_start_time = time.time()
 
-        # 1) Fetch and classify all news
-        classified_news = await self.fetch_and_classify_all_news()
-
-        # 2) Generate and cache bundles for all users
-        await self.generate_and_cache_bundles_for_all_users(classified_news)
+        # Connect the DB pool while the news is being fetched
+        prewarm_task = asyncio.create_task(self._prewarm_db_pool())
 
-        # 3) Generate and cache podcasts for premium users
-        await self.generate_and_cache_podcasts_for_premium_users(classified_news)
+        # 1) Fetch and classify all news
+        try:
+            classified_news = await self.fetch_and_classify_all_news()
+        finally:
+            # Never leave the prewarm running on its own, even if fetching failed
+            await asyncio.gather(prewarm_task, return_exceptions=True)
+
+        # 2) Generate and cache bundles for all users, while
+        # 3) podcasts for premium users are generated (and cached after 2).
+        # Users are loaded once and shared by both tasks. Both are always awaited
+        # to the end, so a failing podcast stage cannot cut the bundle writes short.
+        all_users = await self.get_all_users_from_db()
+        try:
+            bundles_task = asyncio.create_task(
+                self.generate_and_cache_bundles_for_all_users(
+                    classified_news, all_users
+                )
+            )
+            results = await asyncio.gather(
+                bundles_task,
+                self.generate_and_cache_podcasts_for_premium_users(
+                    classified_news, bundles_cached=bundles_task, all_users=all_users
+                ),
+                return_exceptions=True,
+            )
+            for stage, result in zip(("Bundle", "Podcast"), results):
+                if isinstance(result, Exception):
+                    print(f"⚠️ {stage} generation failed: {result}")
+        finally:
+            # The bundle index pins the whole day's news and its prepared copies;
+            # release it once every user has been served
+            self._bundle_index_memo = None
 
         # 4) Retention cleanup
         await self._run_data_retention_cleanup()
@@ -1219,18 +1818,11 @@ if __name__ == "__main__":
             }
             result = await pipeline.process_daily_news(sample_user_prefs)
             if "top_7" in result and result["top_7"]:
-                print(f"\n--- Test API Result for User {args.user_id} ---")
-                for i, article in enumerate(result["top_7"]):
-                    print(f"\n--- Article {i+1} ---")
-                    print(f"📰 Title: {article.get('title')}")
-                    print(f"🔗 URL: {article.get('url')}")
-                    print(f"🏷️  Category: {article.get('category')}")
-                    print(f"📊 Relevance Score: {article.get('relevance_score', 'N/A')}")
-                    print(
-                        f"📈 Importance Score: {article.get('importance_score', 'N/A')}"
-                    )
-                    ynk = article.get("ynk_summary", "N/A")
-                    print(f"💡 YNK Summary: {ynk}")
+                # Emit the whole report with one write instead of a print per line
+                report = [f"\n--- Test API Result for User {args.user_id} ---"]
+                report.extend(pipeline._format_top_7_lines(result["top_7"]))
+                sys.stdout.write("\n".join(report) + "\n")
+                sys.stdout.flush()
 
                 # TEMP: treat even IDs as premium for demo
                 is_premium_user = args.user_id % 2 == 0
@@ -1252,11 +1844,12 @@ if __name__ == "__main__":
                         )
                         podcast = await pipeline._maybe_await(maybe_result)
                         if podcast:
-                            print(
-                                f"\n--- 🎙️  Personalized Podcast Script for User {args.user_id} ---"
+                            sys.stdout.write(
+                                f"\n--- 🎙️  Personalized Podcast Script for User {args.user_id} ---\n"
+                                f"{podcast}\n"
+                                "\n--- 🎧 End of Podcast Script ---\n"
                             )
-                            print(podcast)
-                            print("\n--- 🎧 End of Podcast Script ---")
+                            sys.stdout.flush()
                         else:
                             print(
                                 f"\n⚠️  Podcast script could not be generated for user {args.user_id}."
@@ -3,10 +3,9 @@
 
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from dotenv import load_dotenv
-from mistralai import Mistral
 
 # Load environment variables
 load_dotenv()
@@ -15,6 +14,19 @@ load_dotenv()
 MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
 PODCAST_MODEL = "mistral-small-latest"  # Можно использовать mistral-medium или другой, если нужно больше качества
 
+# orjson (опционально) — компактный JSON для промта без pretty-print
+try:
+    import orjson
+
+    def _dumps_compact(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+except ImportError:
+
+    def _dumps_compact(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
 # Import the prompt
 try:
     from src.prompts import PODCAST_SCRIPT_PROMPT
@@ -33,10 +45,65 @@ class PodcastGenerator:
         if not MISTRAL_API_KEY:
             raise ValueError("MISTRAL_API_KEY not found in environment variables.")
 
+        # Импорт SDK откладываем до создания клиента: сам модуль импортируется
+        # и там, где подкасты не генерируются
+        from mistralai import Mistral
+
         self.client = Mistral(api_key=MISTRAL_API_KEY)
         self.model = PODCAST_MODEL
         print(f"🎙️ PodcastGenerator initialized with model: {self.model}")
 
+    def _build_messages(
+        self, user_profile: Dict[str, Any], top_7_news: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for the podcast script prompt."""
+        # Подготавливаем данные для промта (без отступов: модели они не нужны)
+        user_profile_str = _dumps_compact(user_profile)
+        top_7_json_str = _dumps_compact(top_7_news)
+
+        # Формируем сообщение для Mistral
+        # --- ИСПРАВЛЕНИЕ: system prompt должен быть просто текстом, а данные передаются в user message ---
+        return [
+            {"role": "system", "content": PODCAST_SCRIPT_PROMPT},  # <-- ИСПРАВЛЕНО
+            {
+                "role": "user",
+                "content": f"Generate the podcast script for the user with profile {user_profile.get('email', 'N/A')}.\n\nUser Profile:\n{user_profile_str}\n\nTOP-7 News Items:\n{top_7_json_str}",  # <-- ИСПРАВЛЕНО
+            },
+        ]
+        # --- КОНЕЦ ИСПРАВЛЕНИЯ ---
+
+    def stream_podcast_script(
+        self, user_profile: Dict[str, Any], top_7_news: List[Dict[str, Any]]
+    ) -> Iterator[str]:
+        """
+        Streams a personalized podcast script as Mistral generates it.
+
+        Args:
+            user_profile: Dictionary containing user profile data (id, email, locale, interests).
+            top_7_news: List of dictionaries, each representing a news article with title, ynk_summary, etc.
+
+        Yields:
+            Text fragments of the script in generation order.
+
+        Raises:
+            Exception: Propagates Mistral API errors to the caller.
+        """
+        # Вызываем Mistral API в потоковом режиме; контекстный менеджер закрывает
+        # HTTP-ответ, даже если вызывающий код перестал читать поток раньше
+        with self.client.chat.stream(
+            model=self.model,
+            messages=self._build_messages(user_profile, top_7_news),
+            temperature=0.7,  # Добавим немного креативности
+            max_tokens=2000,  # Ограничиваем длину ответа
+        ) as stream:
+            for event in stream:
+                choices = event.data.choices
+                if not choices:
+                    continue
+                content = choices[0].delta.content
+                if isinstance(content, str) and content:
+                    yield content
+
     def generate_podcast_script(
         self, user_profile: Dict[str, Any], top_7_news: List[Dict[str, Any]]
     ) -> str:
@@ -54,32 +121,11 @@ class PodcastGenerator:
             f"🎙️ Generating podcast script for user {user_profile.get('email', 'N/A')}..."
         )
 
-        # Подготавливаем данные для промта
-        user_profile_str = json.dumps(user_profile, indent=2, ensure_ascii=False)
-        top_7_json_str = json.dumps(top_7_news, indent=2, ensure_ascii=False)
-
-        # Формируем сообщение для Mistral
-        # --- ИСПРАВЛЕНИЕ: system prompt должен быть просто текстом, а данные передаются в user message ---
-        messages = [
-            {"role": "system", "content": PODCAST_SCRIPT_PROMPT},  # <-- ИСПРАВЛЕНО
-            {
-                "role": "user",
-                "content": f"Generate the podcast script for the user with profile {user_profile.get('email', 'N/A')}.\n\nUser Profile:\n{user_profile_str}\n\nTOP-7 News Items:\n{top_7_json_str}",  # <-- ИСПРАВЛЕНО
-            },
-        ]
-        # --- КОНЕЦ ИСПРАВЛЕНИЯ ---
-
         try:
-            # Вызываем Mistral API
-            chat_response = self.client.chat.complete(
-                model=self.model,
-                messages=messages,
-                temperature=0.7,  # Добавим немного креативности
-                max_tokens=2000,  # Ограничиваем длину ответа
-            )
-
-            # Извлекаем текст скрипта
-            script = chat_response.choices[0].message.content.strip()
+            # Собираем потоковый ответ целиком
+            script = "".join(
+                self.stream_podcast_script(user_profile, top_7_news)
+            ).strip()
             print("✅ Podcast script generated successfully.")
             return script
 
@@ -9,7 +9,8 @@ import os
 import re
 from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
 
 from src.logging_config import get_logger
 
@@ -54,6 +55,10 @@ class RankerWeights:
     gamma: float = float(os.getenv("RANK_CAL_GAMMA", "0.95"))  # калибровка хвостов
 
 
+# веса по умолчанию читаются из ENV один раз, а не на каждый вызов
+DEFAULT_WEIGHTS = RankerWeights()
+
+
 # --- АДАПТИВНЫЕ ВЕСА С ОБУЧЕНИЕМ ---
 
 
@@ -354,27 +359,76 @@ def _norm_sub(value: Optional[str]) -> Optional[str]:
     return SYNONYMS.get(v, v)
 
 
-def _match_category_interest(category: str, interests: UserInterests) -> bool:
+InterestIndex = Tuple[FrozenSet[str], Dict[str, FrozenSet[Optional[str]]]]
+
+# Сколько различных наборов интересов держать в кэше индексов
+INTEREST_INDEX_CACHE_SIZE = 1024
+
+# Интересы в хешируемом виде: строки как есть, словари — кортежами пар
+# (категория, кортеж подкатегорий или None); прочие элементы отбрасываются
+InterestsSnapshot = Tuple[Union[str, Tuple[Tuple[Any, Optional[tuple]], ...]], ...]
+
+
+def _interests_snapshot(interests: UserInterests) -> InterestsSnapshot:
+    """Freeze interests into a hashable snapshot (the interest index cache key)."""
+    snapshot: List[Any] = []
     for it in interests:
-        if isinstance(it, str) and it == category:
-            return True
-        if isinstance(it, dict) and category in it:
-            return True
-    return False
+        if isinstance(it, str):
+            snapshot.append(it)
+        elif isinstance(it, dict):
+            snapshot.append(
+                tuple(
+                    (category, tuple(values) if isinstance(values, list) else None)
+                    for category, values in it.items()
+                )
+            )
+    return tuple(snapshot)
+
+
+def _build_interest_index(snapshot: InterestsSnapshot) -> InterestIndex:
+    """Flatten interests into a category set and normalized subcategory sets."""
+    categories = set()
+    subs: Dict[str, set] = {}
+    for it in snapshot:
+        if isinstance(it, str):
+            categories.add(it)
+            continue
+        for category, values in it:
+            categories.add(category)
+            if values is not None:
+                subs.setdefault(category, set()).update(_norm_sub(s) for s in values)
+    return frozenset(categories), {c: frozenset(v) for c, v in subs.items()}
+
+
+# Индексы по снимку интересов (LRU): у пользователей с одинаковыми интересами
+# индекс общий, изменённые интересы дают новый ключ, а размер кэша ограничен.
+# Ничего не хранится на объекте пользователя: его __dict__ отдаётся дальше как
+# профиль (JSON, промт подкаста).
+_cached_interest_index = lru_cache(maxsize=INTEREST_INDEX_CACHE_SIZE)(
+    _build_interest_index
+)
+
+
+def _interest_index(interests: UserInterests) -> InterestIndex:
+    """Return the interest index for interests, reusing it while they are unchanged."""
+    return _cached_interest_index(_interests_snapshot(interests))
+
+
+def _match_category_interest(category: str, index: InterestIndex) -> bool:
+    return category in index[0]
 
 
 def _match_sub_interest(
-    category: str, sub: Optional[str], interests: UserInterests
+    category: str, sub: Optional[str], index: InterestIndex
 ) -> bool:
     if not sub:
         return False
-    sub = _norm_sub(sub)
-    for it in interests:
-        if isinstance(it, dict) and category in it:
-            wanted = {_norm_sub(s) for s in it[category]}
-            if sub in wanted:
-                return True
-    return False
+    wanted = index[1].get(category)
+    return wanted is not None and _norm_sub(sub) in wanted
+
+
+def _haystack(reasons: str, news_text: Optional[str]) -> str:
+    return " ".join(filter(None, [reasons or "", news_text or ""])).lower()
 
 
 def _locale_match(
@@ -382,8 +436,10 @@ def _locale_match(
     news_text: Optional[str],
     user_locale: Optional[str],
     city: Optional[str],
+    hay: Optional[str] = None,
 ) -> bool:
-    hay = " ".join(filter(None, [reasons or "", news_text or ""])).lower()
+    if hay is None:
+        hay = _haystack(reasons, news_text)
     if user_locale and user_locale.lower() in hay:
         return True
     if city and city.lower() in hay:
@@ -391,89 +447,142 @@ def _locale_match(
     return False
 
 
-def _criticality_signal(reasons: str, news_text: Optional[str]) -> bool:
-    hay = " ".join(filter(None, [reasons or "", news_text or ""])).lower()
+def _criticality_signal(
+    reasons: str, news_text: Optional[str], hay: Optional[str] = None
+) -> bool:
+    if hay is None:
+        hay = _haystack(reasons, news_text)
     return any(tok in hay for tok in CRITICAL_TOKENS)
 
 
 # --- публичный API ---
 
 
-def adjust_priority(
-    classification: Dict[str, Any],
-    user: Any,
-    news_text: Optional[str] = None,
-    weights: Optional[Union[RankerWeights, AdaptiveRankerWeights]] = None,
-) -> int:
-    """
-    Итоговый приоритет 0–100 для новости с адаптивными весами.
-    Логика:
-      - Глобальные важные события всегда выше
-      - Локальные усиливаются только если сами по себе значимы
-    """
-    # Handle both static and adaptive weights
+def _resolve_weights(
+    weights: Optional[Union[RankerWeights, AdaptiveRankerWeights]],
+) -> RankerWeights:
     if isinstance(weights, AdaptiveRankerWeights):
-        # Use adaptive weights
-        current_weights = weights.get_current_weights()
-        adaptive_weights_obj = weights
-    else:
-        # Use static weights
-        current_weights = weights or RankerWeights()
-        adaptive_weights_obj = None
-
+        return weights.get_current_weights()
+    return weights or DEFAULT_WEIGHTS
+
+
+def _score_core(
+    w: RankerWeights,
+    importance_score: int,
+    conf: float,
+    cat_match: bool,
+    sub_match: bool,
+    locale_match: bool,
+    critical: bool,
+) -> int:
+    """Числовое ядро скоринга: только примитивы, без словарей и строк."""
     # 1) априори от LLM (now using 0-100 scale from enhanced classifier)
-    importance_score = int(classification.get("importance_score", 50))
     # Convert 0-100 to 0.01-0.99 probability scale
     p_hint = clamp(importance_score / 100.0, 0.01, 0.99)
-    z = current_weights.bias + current_weights.w_hint * logit(p_hint)
+    z = w.bias + w.w_hint * logit(p_hint)
 
     # 2) уверенность модели
-    conf = float(classification.get("confidence", 0.7))
-    z += current_weights.w_conf * (conf - 0.5) * 2.0
+    z += w.w_conf * (conf - 0.5) * 2.0
 
     # 3) категория в интересах
-    interests: UserInterests = getattr(user, "interests", []) or []
-    category: str = classification.get("category", "")
-    if _match_category_interest(category, interests):
-        z += current_weights.w_cat
+    if cat_match:
+        z += w.w_cat
 
     # 4) субкатегории
-    sports_sub = _norm_sub(classification.get("sports_subcategory"))
-    econ_sub = classification.get("economy_subcategory")
-    tech_sub = classification.get("tech_subcategory")
-
-    econ_sub = econ_sub.lower() if isinstance(econ_sub, str) else econ_sub
-    tech_sub = tech_sub.lower() if isinstance(tech_sub, str) else tech_sub
-
-    if category == "sports" and _match_sub_interest("sports", sports_sub, interests):
-        z += current_weights.w_sub
-    if category == "economy_finance" and _match_sub_interest(
-        "economy_finance", econ_sub, interests
-    ):
-        z += current_weights.w_sub
-    if category == "technology_ai_science" and _match_sub_interest(
-        "technology_ai_science", tech_sub, interests
-    ):
-        z += current_weights.w_sub
+    if sub_match:
+        z += w.w_sub
 
     # 5) локаль — условный буст
-    reasons = classification.get("reasons", "") or ""
-    if _locale_match(
-        reasons, news_text, getattr(user, "locale", None), getattr(user, "city", None)
-    ):
-        if conf > 0.6 or _criticality_signal(reasons, news_text):
-            z += current_weights.w_locale  # полноценный буст для важных событий
+    if locale_match:
+        if conf > 0.6 or critical:
+            z += w.w_locale  # полноценный буст для важных событий
         else:
-            z += current_weights.w_locale * 0.2  # слабый эффект для мелких новостей
+            z += w.w_locale * 0.2  # слабый эффект для мелких новостей
 
     # 6) критичность (сильные слова)
-    if _criticality_signal(reasons, news_text):
-        z += current_weights.w_crit
+    if critical:
+        z += w.w_crit
 
     # 7) вероятность → приоритет
     p = sigmoid(z)
-    p_cal = p**current_weights.gamma
-    score = int(round(100 * clamp(p_cal, 0.0, 1.0)))
+    p_cal = p**w.gamma
+    # p_cal >= 0 всегда (sigmoid в [0, 1]), так что нужен только верхний предел;
+    # round() от float уже возвращает int
+    return round(100 * min(p_cal, 1.0))
+
+
+def _score_classification(
+    classification: Dict[str, Any],
+    news_text: Optional[str],
+    current_weights: RankerWeights,
+    index: InterestIndex,
+    user_locale: Optional[str],
+    city: Optional[str],
+) -> int:
+    """Приоритет 0–100 для одной новости (пользовательские данные уже готовы)."""
+    # признаки новости → примитивы для _score_core
+    importance_score = int(classification.get("importance_score", 50))
+    conf = float(classification.get("confidence", 0.7))
+
+    category: str = classification.get("category", "")
+    cat_match = _match_category_interest(category, index)
+
+    # субкатегория проверяется только для своей категории
+    if category == "sports":
+        sub = _norm_sub(classification.get("sports_subcategory"))
+    elif category == "economy_finance":
+        sub = classification.get("economy_subcategory")
+    elif category == "technology_ai_science":
+        sub = classification.get("tech_subcategory")
+    else:
+        sub = None
+    sub = sub.lower() if isinstance(sub, str) else sub
+    sub_match = sub is not None and _match_sub_interest(category, sub, index)
+
+    # текст для поиска собираем один раз: он нужен и локали, и критичности
+    reasons = classification.get("reasons", "") or ""
+    hay = _haystack(reasons, news_text)
+    critical = _criticality_signal(reasons, news_text, hay)
+    locale_match = _locale_match(reasons, news_text, user_locale, city, hay)
+
+    return _score_core(
+        current_weights,
+        importance_score,
+        conf,
+        cat_match,
+        sub_match,
+        locale_match,
+        critical,
+    )
+
+
+def adjust_priority(
+    classification: Dict[str, Any],
+    user: Any,
+    news_text: Optional[str] = None,
+    weights: Optional[Union[RankerWeights, AdaptiveRankerWeights]] = None,
+) -> int:
+    """
+    Итоговый приоритет 0–100 для новости с адаптивными весами.
+    Логика:
+      - Глобальные важные события всегда выше
+      - Локальные усиливаются только если сами по себе значимы
+    """
+    # Handle both static and adaptive weights
+    current_weights = _resolve_weights(weights)
+    adaptive_weights_obj = (
+        weights if isinstance(weights, AdaptiveRankerWeights) else None
+    )
+
+    interests: UserInterests = getattr(user, "interests", []) or []
+    score = _score_classification(
+        classification,
+        news_text,
+        current_weights,
+        _interest_index(interests),
+        getattr(user, "locale", None),
+        getattr(user, "city", None),
+    )
 
     # Record interaction with adaptive system if available
     if adaptive_weights_obj and hasattr(user, "user_id"):
@@ -484,6 +593,51 @@ def adjust_priority(
     return score
 
 
+def adjust_priority_batch(
+    classifications: List[Dict[str, Any]],
+    user: Any,
+    news_texts: Optional[List[Optional[str]]] = None,
+    weights: Optional[Union[RankerWeights, AdaptiveRankerWeights]] = None,
+) -> List[int]:
+    """
+    Приоритеты 0–100 для списка новостей одного пользователя.
+
+    То же, что adjust_priority для каждой новости, но веса, индекс интересов
+    и локаль пользователя вычисляются один раз на весь список.
+
+    Args:
+        classifications: Classification results, one per article
+        user: User profile object
+        news_texts: Original texts aligned with classifications (optional)
+        weights: Static or adaptive weights
+
+    Returns:
+        Scores in the same order as classifications
+
+    Raises:
+        ValueError: If news_texts is given with a different length
+    """
+    if news_texts is None:
+        news_texts = [None] * len(classifications)
+    elif len(news_texts) != len(classifications):
+        raise ValueError(
+            f"news_texts has {len(news_texts)} items, "
+            f"expected {len(classifications)} (one per classification)"
+        )
+
+    current_weights = _resolve_weights(weights)
+    interests: UserInterests = getattr(user, "interests", []) or []
+    index = _interest_index(interests)
+    user_locale = getattr(user, "locale", None)
+    city = getattr(user, "city", None)
+    return [
+        _score_classification(
+            classification, news_text, current_weights, index, user_locale, city
+        )
+        for classification, news_text in zip(classifications, news_texts)
+    ]
+
+
 # --- Enhanced priority adjustment with feedback recording ---
 
 
@@ -0,0 +1,39 @@
+"""Unit tests for the feedback system."""
+
+import pytest
+
+from src.feedback_system import FeedbackSystem
+
+
+@pytest.fixture
+def feedback(tmp_path):
+    return FeedbackSystem(feedback_file=str(tmp_path / "feedback.json"))
+
+
+def test_preferences_default_to_neutral(feedback):
+    assert feedback.get_user_preferences("nobody", ["sports", "nba"]) == {
+        "sports": 0.5,
+        "nba": 0.5,
+    }
+    assert feedback.get_user_preferences("nobody", []) == {}
+
+
+def test_batch_preferences_match_single_lookups(feedback):
+    feedback.add_feedback("u1", "n1", 1, "nba")
+    feedback.add_feedback("u1", "n2", -1, "politics")
+    feedback.add_feedback("u2", "n1", -1, "nba")
+
+    categories = ("nba", "politics", "sports", "nba")
+    prefs = feedback.get_user_preferences("u1", iter(categories))
+    assert prefs == {"nba": 0.6, "politics": 0.4, "sports": 0.5}
+    assert prefs == {c: feedback.get_user_preference("u1", c) for c in categories}
+    assert feedback.get_user_preferences("u2", ["nba"]) == {"nba": 0.4}
+
+
+def test_preferences_survive_a_reload(feedback):
+    feedback.add_feedback("u1", "n1", 1, "nba")
+    reloaded = FeedbackSystem(feedback_file=feedback.feedback_file)
+    assert reloaded.get_user_preferences("u1", ["nba", "sports"]) == {
+        "nba": 0.6,
+        "sports": 0.5,
+    }
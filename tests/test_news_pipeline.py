@@ -0,0 +1,751 @@
+"""Unit tests for the news pipeline (news persistence and TOP-7 selection)."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import operators
+
+from src import news_pipeline
+from src.news_pipeline import AI_ANALYSIS_VERSION, NewsProcessingPipeline
+
+
+class _Row:
+    """Result row stand-in: attribute access plus `_mapping`, like a SQLAlchemy Row."""
+
+    def __init__(self, values):
+        self._mapping = dict(values)
+
+    def __getattr__(self, name):
+        try:
+            return self._mapping[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class FakeNewsItemsTable:
+    """In-memory news_items table: rows by URL plus logs of inserts and updates."""
+
+    def __init__(self):
+        self.rows = {}
+        self.updated_ids = []
+        self.inserted_values = []
+        self.fail_inserts = False
+
+    def values(self):
+        return self.rows.values()
+
+
+class RecordingInsert:
+    """pg_insert stand-in that records the rows passed to .values(...)."""
+
+    def __init__(self, inserted_values, model):
+        self._inserted_values = inserted_values
+        self._model = model
+
+    def values(self, rows):
+        self._inserted_values.append(rows)
+        return postgresql.insert(self._model).values(rows)
+
+
+def _where_matches(clause, row):
+    """Evaluate the simple `column IN (...)` / `column >= value` filters used."""
+    column, value = clause.left.key, clause.right.value
+    if clause.operator is operators.in_op:
+        return row[column] in value
+    if clause.operator is operators.ge:
+        return row[column] >= value
+    raise AssertionError(f"unexpected filter: {clause}")
+
+
+class FakeNewsItemsSession:
+    """Session over a FakeNewsItemsTable, enough for _save_news_items_to_db."""
+
+    def __init__(self, table):
+        self.table = table
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def execute(self, stmt, params=None):
+        if stmt.is_select:
+            return [
+                _Row(row)
+                for row in self.table.values()
+                if _where_matches(stmt.whereclause, row)
+            ]
+        if stmt.is_update:
+            rows_by_id = {row["id"]: row for row in self.table.values()}
+            for values in params:
+                rows_by_id[values["id"]].update(values)
+                self.table.updated_ids.append(values["id"])
+            return None
+
+        # INSERT ... ON CONFLICT (external_id) ... RETURNING id, external_id
+        if self.table.fail_inserts:
+            raise RuntimeError("insert failed")
+        returned = []
+        for row in self.table.inserted_values[-1]:
+            existing = next(
+                (
+                    r
+                    for r in self.table.values()
+                    if r["external_id"] == row["external_id"]
+                ),
+                None,
+            )
+            if existing is None:
+                existing = {"id": len(self.table.rows) + 1, **row}
+                self.table.rows[row["url"]] = existing
+            returned.append((existing["id"], existing["external_id"]))
+        return returned
+
+
+@pytest.fixture
+def pipeline():
+    return NewsProcessingPipeline(max_workers=2)
+
+
+@pytest.fixture
+def news_table(monkeypatch):
+    table = FakeNewsItemsTable()
+    monkeypatch.setattr(news_pipeline, "DATABASE_AVAILABLE", True)
+    monkeypatch.setattr(
+        news_pipeline, "AsyncSessionFactory", lambda: FakeNewsItemsSession(table)
+    )
+    monkeypatch.setattr(
+        news_pipeline,
+        "pg_insert",
+        lambda model: RecordingInsert(table.inserted_values, model),
+    )
+    return table
+
+
+def _article(n, category="politics", relevance=0.9, **extra):
+    return {
+        "title": f"Story {n}",
+        "url": f"https://example.com/{n}",
+        "content": f"Full text of story {n}",
+        "category": category,
+        "relevance_score": relevance,
+        "confidence": 0.8,
+        **extra,
+    }
+
+
+def test_full_save_fills_ynk_of_rank_only_rows(pipeline, news_table):
+    calls = []
+
+    def fake_summarize(text, category):
+        calls.append(text)
+        return f"YNK: {text}"
+
+    pipeline.summarize_news_func = fake_summarize
+
+    # Rank-only run: saved without summaries, summarizer never called
+    saved = asyncio.run(
+        pipeline._save_news_items_to_db(
+            {"politics": [_article(1), _article(2)]}, generate_ynk=False
+        )
+    )
+    assert len(saved) == 2
+    assert calls == []
+    assert all(row["ynk_summary"] is None for row in news_table.values())
+    assert all(
+        row["ai_analysis"]["v"] == AI_ANALYSIS_VERSION for row in news_table.values()
+    )
+
+    # Next full run over the same articles fills the missing summaries
+    saved = asyncio.run(
+        pipeline._save_news_items_to_db(
+            {"politics": [_article(1), _article(2)]}, generate_ynk=True
+        )
+    )
+    assert sorted(calls) == ["Full text of story 1", "Full text of story 2"]
+    assert sorted(news_table.updated_ids) == [1, 2]
+    for row in news_table.values():
+        assert row["ynk_summary"] == f"YNK: Full text of story {row['id']}"
+        assert row["ai_analysis"]["ynk_summary"] == row["ynk_summary"]
+    assert {row["ynk_summary"] for row in saved} == {
+        "YNK: Full text of story 1",
+        "YNK: Full text of story 2",
+    }
+
+    # Once summarized, later runs leave the rows alone
+    news_table.updated_ids.clear()
+    asyncio.run(
+        pipeline._save_news_items_to_db(
+            {"politics": [_article(1), _article(2)]}, generate_ynk=True
+        )
+    )
+    assert news_table.updated_ids == []
+
+
+@pytest.mark.parametrize("legacy_analysis", [["politics", 0.9], "politics", None])
+def test_non_dict_ai_analysis_is_reanalysed(pipeline, news_table, legacy_analysis):
+    news_table.rows["https://example.com/1"] = {
+        "id": 1,
+        "external_id": "https://example.com/1",
+        "source_name": "Unknown",
+        "title": "Story 1",
+        "url": "https://example.com/1",
+        "category": "politics",
+        "subcategory": None,
+        "importance_score": 0,
+        "ai_analysis": legacy_analysis,
+        "relevance_score": None,
+        "confidence": None,
+        "ynk_summary": "Stored summary",
+        "fetched_at": datetime(2024, 1, 1),
+    }
+
+    saved = asyncio.run(
+        pipeline._save_news_items_to_db({"politics": [_article(1)]}, generate_ynk=False)
+    )
+    assert news_table.updated_ids == [1]
+    row = news_table.rows["https://example.com/1"]
+    assert row["ai_analysis"]["v"] == AI_ANALYSIS_VERSION
+    assert row["ynk_summary"] == "Stored summary"
+    assert [item["id"] for item in saved] == [1]
+
+
+def test_saved_items_are_returned_with_ids(pipeline, news_table):
+    saved = asyncio.run(
+        pipeline._save_news_items_to_db(
+            {"politics": [_article(1)], "sports": [_article(2, "sports")]},
+            generate_ynk=False,
+        )
+    )
+    assert sorted(row["id"] for row in saved) == [1, 2]
+    assert all(isinstance(row["fetched_at"], str) for row in saved)
+    datetime.fromisoformat(saved[0]["fetched_at"])
+
+
+def test_insert_sends_one_row_per_external_id(pipeline, news_table):
+    asyncio.run(
+        pipeline._save_news_items_to_db(
+            {
+                "politics": [
+                    _article(1, external_id="wire-1"),
+                    _article(2, external_id="wire-1"),
+                    _article(3),
+                ]
+            },
+            generate_ynk=False,
+        )
+    )
+    (rows,) = news_table.inserted_values
+    assert [(row["external_id"], row["url"]) for row in rows] == [
+        ("wire-1", "https://example.com/1"),
+        ("https://example.com/3", "https://example.com/3"),
+    ]
+    assert {row["title"] for row in rows} == {"Story 1", "Story 3"}
+
+    # Known URLs are resolved by the preload and never inserted again
+    news_table.inserted_values.clear()
+    asyncio.run(
+        pipeline._save_news_items_to_db(
+            {"politics": [_article(1, external_id="wire-1"), _article(4)]},
+            generate_ynk=False,
+        )
+    )
+    (rows,) = news_table.inserted_values
+    assert [row["url"] for row in rows] == ["https://example.com/4"]
+
+
+def test_failed_save_falls_back_to_stored_news(pipeline, news_table):
+    asyncio.run(
+        pipeline._save_news_items_to_db(
+            {"politics": [_article(1), _article(2)]}, generate_ynk=False
+        )
+    )
+
+    # Stored two days ago: outside the fallback window
+    news_table.rows["https://example.com/2"]["fetched_at"] -= timedelta(days=2)
+
+    news_table.fail_inserts = True
+    saved = asyncio.run(
+        pipeline._save_news_items_to_db({"politics": [_article(3)]}, generate_ynk=False)
+    )
+    assert [row["url"] for row in saved] == ["https://example.com/1"]
+    assert isinstance(saved[0]["fetched_at"], str)
+
+
+class _Preferences:
+    """feedback_system stand-in with fixed per-user preference scores."""
+
+    def __init__(self, scores_by_user):
+        self.scores_by_user = scores_by_user
+
+    def get_user_preferences(self, user_id, keys):
+        scores = self.scores_by_user.get(user_id, {})
+        return {key: scores.get(key, 0.5) for key in keys}
+
+
+def _sports_bundle():
+    return [
+        _article(
+            n,
+            "sports",
+            relevance=0.5 + n / 100,
+            sports_subcategory=f"sub{n}",
+            ai_analysis={"ynk_summary": f"Why story {n} matters"},
+        )
+        for n in range(1, 10)
+    ]
+
+
+_ALL_SUBS = [{"sports": [f"sub{n}" for n in range(1, 10)]}]
+
+
+def _urls(articles):
+    return {article["url"] for article in articles}
+
+
+def test_different_preference_orderings_get_different_top_7(pipeline):
+    pipeline.feedback_system = _Preferences(
+        {
+            "likes-high": {f"sub{n}": n for n in range(1, 10)},
+            "likes-low": {f"sub{n}": -n for n in range(1, 10)},
+        }
+    )
+    bundle = _sports_bundle()
+    index = pipeline._get_bundle_index(bundle)
+
+    high = pipeline._build_user_top_7(
+        bundle, {"user_id": "likes-high", "interests": _ALL_SUBS}, index
+    )
+    low = pipeline._build_user_top_7(
+        bundle, {"user_id": "likes-low", "interests": _ALL_SUBS}, index
+    )
+
+    assert len(high) == len(low) == 7
+    assert "https://example.com/9" in _urls(high)
+    assert "https://example.com/1" not in _urls(high)
+    assert "https://example.com/1" in _urls(low)
+    assert "https://example.com/9" not in _urls(low)
+    assert len(index["selections"]) == 2
+
+
+def test_users_with_identical_targets_share_one_top_7(pipeline):
+    same_scores = {f"sub{n}": n for n in range(1, 10)}
+    pipeline.feedback_system = _Preferences({"a": same_scores, "b": same_scores})
+    bundle = _sports_bundle()
+    index = pipeline._get_bundle_index(bundle)
+
+    first = pipeline._build_user_top_7(
+        bundle, {"user_id": "a", "interests": _ALL_SUBS}, index
+    )
+    second = pipeline._build_user_top_7(
+        bundle, {"user_id": "b", "interests": _ALL_SUBS}, index
+    )
+
+    assert len(index["selections"]) == 1
+    assert len(first) == 7
+    assert all(x is y for x, y in zip(first, second))
+    # Prepared copies are cache-ready and leave the shared bundle untouched
+    assert all(a["ynk_summary"].startswith("Why story") for a in first)
+    assert all("ai_analysis" not in article for article in first)
+    assert all("ai_analysis" in article for article in bundle)
+
+
+def test_new_bundle_object_invalidates_the_index(pipeline):
+    bundle = _sports_bundle()
+    index = pipeline._get_bundle_index(bundle)
+    assert pipeline._get_bundle_index(bundle) is index
+
+    # Same content in a new object is a new bundle
+    assert pipeline._get_bundle_index(list(bundle)) is not index
+
+    fresher = [_article(n, "politics", relevance=0.95) for n in range(20, 30)]
+    top_7 = pipeline._select_top_articles_for_user(
+        fresher, {"user_id": "anyone", "interests": []}
+    )
+    assert _urls(top_7) <= _urls(fresher)
+    assert pipeline._get_bundle_index(fresher) is not index
+
+
+def test_daily_run_releases_the_bundle_index(pipeline, monkeypatch):
+    bundle = _sports_bundle()
+
+    async def fetch_and_classify_all_news():
+        return bundle
+
+    async def generate_bundles(classified_news, all_users=None):
+        pipeline._build_user_top_7(classified_news, {"user_id": 1, "interests": []})
+
+    async def noop(*args, **kwargs):
+        return []
+
+    monkeypatch.setattr(pipeline, "_prewarm_db_pool", noop)
+    monkeypatch.setattr(
+        pipeline, "fetch_and_classify_all_news", fetch_and_classify_all_news
+    )
+    monkeypatch.setattr(pipeline, "get_all_users_from_db", noop)
+    monkeypatch.setattr(
+        pipeline, "generate_and_cache_bundles_for_all_users", generate_bundles
+    )
+    monkeypatch.setattr(pipeline, "generate_and_cache_podcasts_for_premium_users", noop)
+    monkeypatch.setattr(pipeline, "_run_data_retention_cleanup", noop)
+
+    asyncio.run(pipeline.run_full_daily_pipeline())
+    assert pipeline._bundle_index_memo is None
+
+
+def test_podcast_failure_does_not_cut_bundle_writes_short(pipeline, monkeypatch):
+    events = []
+
+    async def fetch_and_classify_all_news():
+        return _sports_bundle()
+
+    async def get_all_users_from_db():
+        return [{"id": 1, "email": "a@example.com", "is_premium": True}]
+
+    async def generate_bundles(classified_news, all_users=None):
+        # Chunked writes yield to the loop between upserts
+        for chunk in range(3):
+            await asyncio.sleep(0)
+            events.append(f"bundle chunk {chunk}")
+
+    async def generate_podcasts(classified_news, bundles_cached=None, all_users=None):
+        raise RuntimeError("podcast stage failed")
+
+    async def cleanup():
+        events.append("cleanup")
+
+    async def noop(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(pipeline, "_prewarm_db_pool", noop)
+    monkeypatch.setattr(
+        pipeline, "fetch_and_classify_all_news", fetch_and_classify_all_news
+    )
+    monkeypatch.setattr(pipeline, "get_all_users_from_db", get_all_users_from_db)
+    monkeypatch.setattr(
+        pipeline, "generate_and_cache_bundles_for_all_users", generate_bundles
+    )
+    monkeypatch.setattr(
+        pipeline, "generate_and_cache_podcasts_for_premium_users", generate_podcasts
+    )
+    monkeypatch.setattr(pipeline, "_run_data_retention_cleanup", cleanup)
+
+    asyncio.run(pipeline.run_full_daily_pipeline())
+    assert events == ["bundle chunk 0", "bundle chunk 1", "bundle chunk 2", "cleanup"]
+
+
+def test_failed_fetch_still_finishes_the_pool_prewarm(pipeline, monkeypatch):
+    prewarmed = []
+
+    async def prewarm():
+        for _ in range(3):
+            await asyncio.sleep(0)
+        prewarmed.append(True)
+
+    async def fetch_and_classify_all_news():
+        raise RuntimeError("fetch failed")
+
+    monkeypatch.setattr(pipeline, "_prewarm_db_pool", prewarm)
+    monkeypatch.setattr(
+        pipeline, "fetch_and_classify_all_news", fetch_and_classify_all_news
+    )
+
+    with pytest.raises(RuntimeError, match="fetch failed"):
+        asyncio.run(pipeline.run_full_daily_pipeline())
+    assert prewarmed == [True]
+
+
+def test_podcast_rank_failure_is_contained(pipeline, monkeypatch, news_table):
+    class _Generator:
+        def generate_podcast_script(self, profile, top_7):
+            raise AssertionError("no script should be generated")
+
+    def broken_index(classified_news_list):
+        raise RuntimeError("index failed")
+
+    monkeypatch.setattr(news_pipeline, "PODCAST_GENERATOR_AVAILABLE", True)
+    monkeypatch.setattr(news_pipeline, "UserNewsCache", object())
+    pipeline.podcast_generator = _Generator()
+    monkeypatch.setattr(pipeline, "_get_bundle_index", broken_index)
+
+    users = [
+        {
+            "id": 1,
+            "email": "a@example.com",
+            "is_premium": True,
+            "profile": {"user_id": 1, "interests": []},
+        }
+    ]
+    asyncio.run(
+        pipeline.generate_and_cache_podcasts_for_premium_users(
+            _sports_bundle(), all_users=users
+        )
+    )
+
+
+class FakeCacheSession:
+    """user_news_cache session: records executed statements and open sessions."""
+
+    def __init__(self, log):
+        self.log = log
+
+    async def __aenter__(self):
+        self.log["open"] += 1
+        self.log["max_open"] = max(self.log["max_open"], self.log["open"])
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.log["open"] -= 1
+        return False
+
+    async def execute(self, stmt, params=None):
+        # Let other chunks run while this one "waits on the DB"
+        await asyncio.sleep(0)
+        self.log["statements"].append(stmt)
+        return []
+
+    async def commit(self):
+        self.log["commits"] += 1
+
+    async def rollback(self):
+        pass
+
+
+@pytest.fixture
+def cache_log(monkeypatch):
+    log = {
+        "statements": [],
+        "inserted_values": [],
+        "commits": 0,
+        "open": 0,
+        "max_open": 0,
+    }
+    monkeypatch.setattr(news_pipeline, "DATABASE_AVAILABLE", True)
+    monkeypatch.setattr(
+        news_pipeline, "AsyncSessionFactory", lambda: FakeCacheSession(log)
+    )
+    monkeypatch.setattr(
+        news_pipeline,
+        "pg_insert",
+        lambda model: RecordingInsert(log["inserted_values"], model),
+    )
+    return log
+
+
+def _users(count, **extra):
+    return [
+        {
+            "id": n,
+            "email": f"user{n}@example.com",
+            "profile": {"user_id": n, "interests": ["sports"]},
+            **extra,
+        }
+        for n in range(1, count + 1)
+    ]
+
+
+def _compiled_sql(stmt):
+    return " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+
+
+def test_bundle_upsert_replaces_todays_bundle(pipeline, cache_log):
+    pipeline.feedback_system = _Preferences({})
+    asyncio.run(
+        pipeline.generate_and_cache_bundles_for_all_users(
+            _sports_bundle(), all_users=_users(3)
+        )
+    )
+
+    for stmt in cache_log["statements"]:
+        sql = _compiled_sql(stmt)
+        assert sql.startswith("INSERT INTO user_news_cache")
+        assert (
+            "ON CONFLICT (user_id, news_date) DO UPDATE SET "
+            "news_bundle = excluded.news_bundle, generated_at = excluded.generated_at"
+        ) in sql
+    rows = [row for chunk in cache_log["inserted_values"] for row in chunk]
+    assert sorted(row["user_id"] for row in rows) == [1, 2, 3]
+    for row in rows:
+        # The whole bundle is written, so it replaces any earlier one for today
+        assert set(row["news_bundle"]) == {"generated_at", "top_7"}
+        assert len(row["news_bundle"]["top_7"]) == 7
+
+
+class _ScriptWriter:
+    """podcast_generator stand-in returning a fixed script per user."""
+
+    def generate_podcast_script(self, profile, top_7):
+        return f"Podcast for {profile['user_id']}"
+
+
+def test_cache_writes_are_capped_per_statement(pipeline, cache_log, monkeypatch):
+    monkeypatch.setattr(pipeline, "CACHE_WRITE_CHUNK_SIZE", 2)
+    pipeline.feedback_system = _Preferences({})
+    pipeline.podcast_generator = _ScriptWriter()
+
+    # Two workers would take 3 users each; the cap splits them further
+    asyncio.run(
+        pipeline.generate_and_cache_bundles_for_all_users(
+            _sports_bundle(), all_users=_users(5)
+        )
+    )
+    assert sorted(len(rows) for rows in cache_log["inserted_values"]) == [1, 2, 2]
+    assert cache_log["commits"] == 3
+
+    cache_log["inserted_values"].clear()
+    cache_log["commits"] = 0
+    asyncio.run(
+        pipeline.generate_and_cache_podcasts_for_premium_users(
+            _sports_bundle(), all_users=_users(5, is_premium=True)
+        )
+    )
+    assert [len(rows) for rows in cache_log["inserted_values"]] == [2, 2, 1]
+    assert cache_log["commits"] == 3
+
+
+def test_bundle_chunks_are_written_concurrently_within_bound(
+    pipeline, cache_log, monkeypatch
+):
+    pipeline.feedback_system = _Preferences({})
+
+    # Six users over two workers: two chunks of three, written side by side
+    asyncio.run(
+        pipeline.generate_and_cache_bundles_for_all_users(
+            _sports_bundle(), all_users=_users(6)
+        )
+    )
+    assert [len(rows) for rows in cache_log["inserted_values"]] == [3, 3]
+    assert cache_log["max_open"] == 2
+
+    # More chunks than workers: never more than max_workers sessions at once
+    monkeypatch.setattr(pipeline, "CACHE_WRITE_CHUNK_SIZE", 1)
+    cache_log["inserted_values"].clear()
+    cache_log["max_open"] = 0
+    asyncio.run(
+        pipeline.generate_and_cache_bundles_for_all_users(
+            _sports_bundle(), all_users=_users(6)
+        )
+    )
+    assert len(cache_log["inserted_values"]) == 6
+    assert cache_log["max_open"] == 2
+
+
+class _SlowScriptWriter:
+    """Blocking podcast_generator stand-in that tracks calls in flight."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def generate_podcast_script(self, profile, top_7):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        if profile["user_id"] == 3:
+            raise RuntimeError("model unavailable")
+        return f"Podcast for {profile['user_id']}"
+
+
+def test_podcast_scripts_are_generated_within_the_bound(pipeline, cache_log):
+    pipeline.feedback_system = _Preferences({})
+    writer = pipeline.podcast_generator = _SlowScriptWriter()
+
+    asyncio.run(
+        pipeline.generate_and_cache_podcasts_for_premium_users(
+            _sports_bundle(), all_users=_users(6, is_premium=True)
+        )
+    )
+    assert writer.max_in_flight == pipeline.max_workers == 2
+
+    scripts = {
+        row["user_id"]: row["news_bundle"]["podcast_script"]
+        for rows in cache_log["inserted_values"]
+        for row in rows
+    }
+    assert sorted(scripts) == [1, 2, 3, 4, 5, 6]
+    assert scripts[1] == "Podcast for 1"
+    # One failed generation falls back without affecting the other users
+    assert scripts[3].startswith("Sorry")
+
+
+def test_only_premium_users_get_podcasts(pipeline, cache_log):
+    pipeline.feedback_system = _Preferences({})
+    pipeline.podcast_generator = _ScriptWriter()
+    users = _users(4)
+    users[1]["is_premium"] = users[3]["is_premium"] = True
+    users[2]["is_premium"] = False
+
+    asyncio.run(
+        pipeline.generate_and_cache_podcasts_for_premium_users(
+            _sports_bundle(), all_users=users
+        )
+    )
+    (rows,) = cache_log["inserted_values"]
+    assert [row["user_id"] for row in rows] == [2, 4]
+
+
+def test_premium_users_are_filtered_in_sql(pipeline, cache_log):
+    assert asyncio.run(pipeline.get_all_users_from_db(premium_only=True)) == []
+    (stmt,) = cache_log["statements"]
+    assert "WHERE user_profiles.is_premium IS true" in _compiled_sql(stmt)
+
+    cache_log["statements"].clear()
+    asyncio.run(pipeline.get_all_users_from_db())
+    (stmt,) = cache_log["statements"]
+    assert "is_premium IS" not in _compiled_sql(stmt)
+
+
+def test_dict_interest_keys_count_as_main_categories(pipeline):
+    main, subs = pipeline._get_interest_targets(
+        {
+            "user_id": "dict-keys",
+            "interests": [
+                "politics",
+                {"sports": ["nba"]},
+                {"economy_finance": None},
+                "politics",
+            ],
+        }
+    )
+    assert main == ["politics", "sports", "economy_finance"]
+    assert subs == {"nba"}
+
+    # A dict-only interest still guarantees one article of its category
+    pipeline.feedback_system = None
+    bundle = _sports_bundle() + [_article(50, "economy_finance", relevance=0.45)]
+    top_7 = pipeline._select_top_articles_for_user(
+        bundle, {"user_id": "dict-only", "interests": [{"economy_finance": []}]}
+    )
+    assert "https://example.com/50" in _urls(top_7)
+
+
+def test_titles_are_deduplicated_casefolded(pipeline):
+    pipeline.feedback_system = None
+    bundle = [
+        _article(1, relevance=0.99, title="Straße closed  "),
+        _article(2, relevance=0.98, title="STRASSE CLOSED"),
+        _article(3, relevance=0.97, title="Strasse Closed"),
+        *[_article(n, relevance=0.5 + n / 100) for n in range(4, 12)],
+    ]
+    top_7 = pipeline._select_top_articles_for_user(
+        bundle, {"user_id": "dedup", "interests": ["politics"]}
+    )
+    assert len(top_7) == 7
+    urls = _urls(top_7)
+    assert "https://example.com/1" in urls
+    assert not urls & {"https://example.com/2", "https://example.com/3"}
@@ -0,0 +1,101 @@
+"""Unit tests for the podcast generator (streamed script generation)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.podcast_generator import PodcastGenerator
+
+
+def _event(content):
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(data=SimpleNamespace(choices=[SimpleNamespace(delta=delta)]))
+
+
+class FakeStream:
+    """Streamed chat response: iterable events plus the context-manager close."""
+
+    def __init__(self, events, error=None):
+        self.events = events
+        self.error = error
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+        return False
+
+    def __iter__(self):
+        yield from self.events
+        if self.error is not None:
+            raise self.error
+
+
+class FakeChat:
+    def __init__(self, stream):
+        self._stream = stream
+        self.calls = []
+
+    def stream(self, **kwargs):
+        self.calls.append(kwargs)
+        return self._stream
+
+
+def _generator(stream):
+    generator = PodcastGenerator.__new__(PodcastGenerator)
+    generator.client = SimpleNamespace(chat=FakeChat(stream))
+    generator.model = "test-model"
+    return generator
+
+
+_PROFILE = {"email": "a@example.com", "interests": ["sports"]}
+_TOP_7 = [{"title": "Match report"}]
+
+
+def test_script_is_joined_from_the_stream():
+    stream = FakeStream(
+        [
+            _event("  Hello"),
+            SimpleNamespace(data=SimpleNamespace(choices=[])),
+            _event(None),
+            _event(", listener."),
+            _event("  "),
+        ]
+    )
+    generator = _generator(stream)
+
+    assert generator.generate_podcast_script(_PROFILE, _TOP_7) == "Hello, listener."
+    assert stream.closed
+    assert generator.client.chat.calls[0]["model"] == "test-model"
+
+
+def test_stream_is_closed_when_the_caller_stops_early():
+    stream = FakeStream([_event("first"), _event("second")])
+    chunks = _generator(stream).stream_podcast_script(_PROFILE, _TOP_7)
+
+    assert next(chunks) == "first"
+    assert not stream.closed
+    chunks.close()
+    assert stream.closed
+
+
+def test_stream_is_closed_when_it_fails():
+    stream = FakeStream([_event("partial")], error=RuntimeError("connection reset"))
+    generator = _generator(stream)
+
+    with pytest.raises(RuntimeError):
+        list(generator.stream_podcast_script(_PROFILE, _TOP_7))
+    assert stream.closed
+
+    stream.closed = False
+    script = generator.generate_podcast_script(_PROFILE, _TOP_7)
+    assert script.endswith("- Match report")
+    assert stream.closed
+
+
+def test_prompt_accepts_non_string_keys():
+    generator = _generator(FakeStream([]))
+    messages = generator._build_messages({"email": "a@example.com", 7: "x"}, _TOP_7)
+    assert '"7":"x"' in messages[1]["content"]
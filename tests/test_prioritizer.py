@@ -0,0 +1,119 @@
+"""Unit tests for the prioritizer module."""
+
+import json
+
+import pytest
+
+from src import prioritizer
+from src.prioritizer import adjust_priority, adjust_priority_batch
+
+
+class _User:
+    """Plain user profile, shaped like src.user_profile.UserProfile."""
+
+    def __init__(self, user_id, interests, locale=None, city=None):
+        self.user_id = user_id
+        self.interests = interests
+        self.locale = locale
+        self.city = city
+
+
+def _classification(category, **extra):
+    return {"category": category, "importance_score": 60, "confidence": 0.7, **extra}
+
+
+def test_user_profile_stays_serializable():
+    user = _User("serializable", ["politics", {"sports": ["nba"]}])
+    before = dict(vars(user))
+    adjust_priority(_classification("sports", sports_subcategory="nba"), user)
+    assert vars(user) == before
+    json.dumps(vars(user))
+
+
+def test_in_place_interest_changes_are_picked_up():
+    user = _User("in-place", ["sports", "politics"])
+    tech = _classification("technology_ai_science")
+    before = adjust_priority(tech, user)
+
+    user.interests.append("technology_ai_science")
+    assert adjust_priority(tech, user) > before
+
+    user.interests.remove("technology_ai_science")
+    assert adjust_priority(tech, user) == before
+
+
+def test_non_list_subcategory_values_are_ignored():
+    user = _User("no-subs", [{"sports": None}])
+    matched = adjust_priority(_classification("sports", sports_subcategory="nba"), user)
+    other = adjust_priority(_classification("politics"), user)
+    assert matched > other
+
+
+def test_interest_index_cache_is_bounded_and_shared():
+    cache = prioritizer._cached_interest_index
+    assert cache.cache_info().maxsize == prioritizer.INTEREST_INDEX_CACHE_SIZE
+
+    sports = _classification("sports", sports_subcategory="nba")
+    first = _User("shared-1", ["politics", {"sports": ["nba"]}])
+    second = _User("shared-2", ["politics", {"sports": ["nba"]}])
+    adjust_priority(sports, first)
+    hits = cache.cache_info().hits
+    assert adjust_priority(sports, second) == adjust_priority(sports, first)
+    assert cache.cache_info().hits == hits + 2
+
+
+def _batch_cases():
+    classifications, texts = [], []
+    for category, subcategories in (
+        ("sports", {"sports_subcategory": "Premier_League"}),
+        ("sports", {"sports_subcategory": "nba"}),
+        ("sports", {}),
+        ("economy_finance", {"economy_subcategory": "Crypto"}),
+        ("technology_ai_science", {"tech_subcategory": "AI"}),
+        ("technology_ai_science", {"tech_subcategory": "robotics"}),
+        ("politics", {}),
+        ("", {}),
+    ):
+        for reasons, text, confidence in (
+            ("", None, 0.5),
+            ("Affects DE markets", None, 0.5),
+            ("", "Berlin announces evacuation", 0.9),
+            ("Championship final", "", 0.3),
+        ):
+            classifications.append(
+                _classification(
+                    category, reasons=reasons, confidence=confidence, **subcategories
+                )
+            )
+            texts.append(text)
+    return classifications, texts
+
+
+def test_batch_matches_per_item_scores():
+    user = _User(
+        "batch",
+        [
+            "economy_finance",
+            {"sports": ["football_epl", "nba"]},
+            {"technology_ai_science": ["ai"]},
+            {"economy_finance": ["crypto"]},
+        ],
+        locale="DE",
+        city="Berlin",
+    )
+    classifications, texts = _batch_cases()
+
+    assert adjust_priority_batch(classifications, user, texts) == [
+        adjust_priority(c, user, t) for c, t in zip(classifications, texts)
+    ]
+    assert adjust_priority_batch(classifications, user) == [
+        adjust_priority(c, user) for c in classifications
+    ]
+    assert adjust_priority_batch([], user) == []
+
+
+def test_batch_rejects_mismatched_news_texts():
+    user = _User("batch-mismatch", ["politics"])
+    classifications, texts = _batch_cases()
+    with pytest.raises(ValueError):
+        adjust_priority_batch(classifications, user, texts[:-1])